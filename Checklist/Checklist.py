@@ -3,6 +3,7 @@
 # Import all the pages.
 from .pages import *
 from . import styles
+from .backend import evidence_api, stats_api
 
 import reflex as rx
 
@@ -12,3 +13,9 @@ app = rx.App(
     style=styles.base_style,
     stylesheets=styles.base_stylesheets,
 )
+
+# Resumable, chunked evidence uploads.
+evidence_api.register(app.api)
+
+# Read-only cache and session counters.
+stats_api.register(app.api)
@@ -0,0 +1,102 @@
+"""Row-level changes between versions of a cached dataset."""
+
+from collections import deque
+from typing import Deque, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from .item_store import ItemStore
+
+
+class DatasetChange(NamedTuple):
+    """The rows that changed when a dataset moved to ``version``.
+
+    ``inserted`` and ``updated`` index the new store; ``deleted`` and
+    ``replaced`` (the previous rows of ``updated``) index the old one.
+    """
+
+    version: int
+    inserted: np.ndarray
+    updated: np.ndarray
+    deleted: np.ndarray
+    replaced: np.ndarray
+    # False when the file was reloaded, so rows may also have moved.
+    appended_only: bool
+
+    @property
+    def row_count(self) -> int:
+        """Return the number of inserted, updated and deleted rows."""
+        return len(self.inserted) + len(self.updated) + len(self.deleted)
+
+
+def appended(version: int, start: int, stop: int) -> DatasetChange:
+    """Return the change of rows ``start`` to ``stop`` appended to a store."""
+    none = np.array([], dtype=np.int64)
+    return DatasetChange(
+        version, np.arange(start, stop, dtype=np.int64), none, none, none, True
+    )
+
+
+def _keyed(store: ItemStore) -> pd.DataFrame:
+    """Return the rows of ``store`` keyed by name and occurrence of the name."""
+    frame = pd.DataFrame(
+        {
+            "name": store.name,
+            "payment": store.payment,
+            "date": store.date,
+            "status": store.status,
+            "row": np.arange(len(store), dtype=np.int64),
+        }
+    )
+    frame["occurrence"] = frame.groupby("name", sort=False).cumcount()
+    return frame
+
+
+def diff_stores(version: int, old: ItemStore, new: ItemStore) -> DatasetChange:
+    """Compare two snapshots of a dataset row by row.
+
+    Items have no identifier, so the n-th row with a given name in ``old``
+    is matched with the n-th row with that name in ``new``.
+    """
+    merged = _keyed(old).merge(
+        _keyed(new),
+        on=["name", "occurrence"],
+        how="outer",
+        suffixes=("_old", "_new"),
+        indicator=True,
+    )
+    both = merged[merged["_merge"] == "both"]
+    changed = (
+        (both["payment_old"] != both["payment_new"])
+        | (both["date_old"] != both["date_new"])
+        | (both["status_old"] != both["status_new"])
+    )
+    updated = both.loc[changed].sort_values("row_new")
+    return DatasetChange(
+        version,
+        np.sort(merged.loc[merged["_merge"] == "right_only", "row_new"].to_numpy(np.int64)),
+        updated["row_new"].to_numpy(np.int64),
+        np.sort(merged.loc[merged["_merge"] == "left_only", "row_old"].to_numpy(np.int64)),
+        updated["row_old"].to_numpy(np.int64),
+        False,
+    )
+
+
+class ChangeLog:
+    """The most recent changes of a dataset, oldest first."""
+
+    def __init__(self, size: int = 32):
+        self._changes: Deque[DatasetChange] = deque(maxlen=size)
+
+    def record(self, change: DatasetChange):
+        self._changes.append(change)
+
+    def since(self, version: int) -> Optional[List[DatasetChange]]:
+        """Return the changes after ``version``, or None if some were dropped."""
+        changes = [change for change in self._changes if change.version > version]
+        if changes and changes[0].version != version + 1:
+            return None
+        if not changes and self._changes and self._changes[-1].version < version:
+            return None
+        return changes
@@ -0,0 +1,165 @@
+"""Process-wide catalog of the checklists and their progress counters.
+
+The summaries are shared by every session and saved to
+``checklists/catalog.json`` when a checklist is created, so it shows up in
+all other sessions. Counter updates are appended to ``catalog.log`` and
+replayed over the catalog when it is read. The items of each checklist
+live in its partition file next to the catalog.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .item_store import ItemStore
+from .partitions import (
+    PARTITIONS_DIR,
+    add_items,
+    load_partition,
+    partition_path,
+    set_status,
+)
+from .progress import checklist_id, record_status_change, summary
+
+
+CATALOG_FILE = "catalog.json"
+COUNTERS_LOG = "catalog.log"
+
+# Fields saved per checklist; Status and Progress follow from the counters.
+_SAVED_FIELDS = ["Id", "Name", "Owner", "Done", "Total"]
+
+
+class ChecklistExistsError(ValueError):
+    """Raised when a checklist with the same identifier already exists."""
+
+
+# Summaries by checklist id, in creation order; read from disk on first use.
+_summaries: Optional[Dict[str, Dict[str, Any]]] = None
+_lock = threading.Lock()
+
+
+def _catalog_path() -> str:
+    return os.path.join(PARTITIONS_DIR, CATALOG_FILE)
+
+
+def _log_path() -> str:
+    return os.path.join(PARTITIONS_DIR, COUNTERS_LOG)
+
+
+def _replay_counters(summaries: Dict[str, Dict[str, Any]]):
+    """Apply the logged counters to the summaries read from the catalog.
+
+    Each line holds the new Done counter of one checklist, so replaying a
+    line twice is harmless; an incomplete last line is skipped.
+    """
+    try:
+        with open(_log_path(), encoding="utf-8") as file:
+            lines = file.read().splitlines()
+    except FileNotFoundError:
+        return
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        checklist = summaries.get(record["Id"])
+        if checklist is not None:
+            summaries[record["Id"]] = summary(
+                checklist["Name"], checklist["Owner"], record["Done"], checklist["Total"]
+            )
+
+
+def _loaded() -> Dict[str, Dict[str, Any]]:
+    global _summaries
+    if _summaries is None:
+        try:
+            with open(_catalog_path(), encoding="utf-8") as file:
+                records = json.load(file)
+        except FileNotFoundError:
+            records = []
+        _summaries = {
+            record["Id"]: summary(
+                record["Name"], record["Owner"], record["Done"], record["Total"]
+            )
+            for record in records
+        }
+        _replay_counters(_summaries)
+    return _summaries
+
+
+def _save():
+    """Atomically replace the catalog file with the current summaries.
+
+    The counters log is folded into the new catalog, so it is emptied.
+    """
+    records = [
+        {field: checklist[field] for field in _SAVED_FIELDS}
+        for checklist in _loaded().values()
+    ]
+    os.makedirs(PARTITIONS_DIR, exist_ok=True)
+    fd, name = tempfile.mkstemp(prefix="catalog_", dir=PARTITIONS_DIR)
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
+        json.dump(records, file)
+    os.replace(name, _catalog_path())
+    try:
+        os.remove(_log_path())
+    except FileNotFoundError:
+        pass
+
+
+def _log_counters(checklist: Dict[str, Any]):
+    """Append the Done counter of ``checklist`` to the counters log."""
+    with open(_log_path(), "a", encoding="utf-8") as file:
+        file.write(json.dumps({"Id": checklist["Id"], "Done": checklist["Done"]}) + "\n")
+
+
+def checklists() -> List[Dict[str, Any]]:
+    """Return a copy of every checklist summary, in creation order."""
+    with _lock:
+        return [dict(checklist) for checklist in _loaded().values()]
+
+
+def add_checklist(name: str, owner: str, df: pd.DataFrame) -> Dict[str, Any]:
+    """Create the checklist ``name`` with the item rows of ``df``.
+
+    The items are written to a new partition in one batch and the summary
+    is added to the catalog.
+
+    Raises:
+        ChecklistExistsError: If the checklist or its partition already exists.
+    """
+    key = checklist_id(name)
+    with _lock:
+        if key in _loaded() or os.path.exists(partition_path(key)):
+            raise ChecklistExistsError(f"A checklist named '{name}' already exists.")
+        add_items(key, df)
+        _loaded()[key] = summary(name, owner, 0, len(df))
+        _save()
+        return dict(_loaded()[key])
+
+
+def open_checklist(checklist_id: str) -> ItemStore:
+    """Load the items of a checklist.
+
+    Its counters are kept up to date by ``set_item_status`` rather than
+    counted again here. Raises the errors of ``load_partition``.
+    """
+    return load_partition(checklist_id)
+
+
+def set_item_status(checklist_id: str, row: int, status: str):
+    """Change the status of item ``row`` of a checklist and update its counters.
+
+    The counters are adjusted in O(1) from the old and new status, and only
+    the changed status and counter are written.
+    """
+    old = set_status(checklist_id, row, status)
+    with _lock:
+        checklist = _loaded().get(checklist_id)
+        if checklist is not None:
+            record_status_change(checklist, old, status)
+            _log_counters(checklist)
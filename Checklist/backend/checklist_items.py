@@ -0,0 +1,42 @@
+"""Creation of checklists from pasted item lines."""
+
+import datetime
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from .checklist_catalog import add_checklist
+
+NEW_ITEM_STATUS = "Pending"
+
+
+def item_lines(text: str) -> List[str]:
+    """Return the non-blank lines of ``text``, stripped, in one pass."""
+    return [line for line in map(str.strip, text.splitlines()) if line]
+
+
+def items_frame(names: List[str], day: datetime.date) -> pd.DataFrame:
+    """Return new pending items named ``names`` as one frame of item rows."""
+    return pd.DataFrame(
+        {
+            "name": names,
+            "payment": 0.0,
+            "date": day.isoformat(),
+            "status": NEW_ITEM_STATUS,
+        },
+        index=pd.RangeIndex(len(names)),
+    )
+
+
+def create_checklist(name: str, owner: str, text: str) -> Dict[str, Any]:
+    """Store the items pasted as ``text`` in one batch and return the summary.
+
+    Every line becomes a pending item; all of them are written to the
+    checklist's partition at once rather than one write per line.
+
+    Raises:
+        ChecklistExistsError: If a checklist with the same identifier exists.
+    """
+    return add_checklist(
+        name, owner, items_frame(item_lines(text), datetime.date.today())
+    )
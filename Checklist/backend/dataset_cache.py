@@ -0,0 +1,293 @@
+"""Process-wide cache of parsed item datasets shared by every session.
+
+The files are appended to by other systems, so a change that only adds
+lines at the end is parsed incrementally: the bytes after the last parsed
+line are read, validated and appended to the cached store. Any other
+change (truncation, a rewrite) reloads the whole file. Every change bumps
+the dataset version that open sessions poll, and the rows inserted,
+updated or deleted by each change are kept in a ``ChangeLog``.
+"""
+
+import io
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from .change_feed import ChangeLog, DatasetChange, appended, diff_stores
+from .item_store import ItemStore, read_csv
+from .validation import ValidationReport, validate_columns
+
+
+# Bytes before the parsed offset compared to tell an append from a rewrite.
+FINGERPRINT_SIZE = 256
+
+
+class _Entry(NamedTuple):
+    signature: Tuple[int, int]
+    store: ItemStore
+    report: ValidationReport
+    # Incremented whenever the snapshot of the file changes.
+    version: int
+    # Bytes parsed so far; appends are read from here.
+    offset: int
+    # Empty when the file cannot be appended to, e.g. no final newline.
+    header: bytes
+    fingerprint: bytes
+
+
+_entries: Dict[str, _Entry] = {}
+_changes: Dict[str, ChangeLog] = {}
+# Guards the dicts above and is only held briefly, never while parsing, so
+# ``dataset_version`` stays cheap to call from the event loop.
+_lock = threading.Lock()
+# One parser per file at a time, by path.
+_loading: Dict[str, threading.Lock] = {}
+_stats = {"hits": 0, "misses": 0, "reloads": 0, "appends": 0}
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    """Return the (size, mtime) pair used to detect changes to ``path``."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _parse_frame(df: pd.DataFrame) -> Tuple[ItemStore, ValidationReport]:
+    """Validate raw item rows into a store of the accepted rows."""
+    report, payment, date_value = validate_columns(df)
+    df["payment"] = payment
+    valid = report.accepted
+    return ItemStore.from_frame(df[valid], date_value[valid]), report
+
+
+def parse_items(path) -> Tuple[ItemStore, ValidationReport]:
+    """Parse and validate an items CSV file (a path or buffer) into a frozen store."""
+    store, report = _parse_frame(read_csv(path))
+    store.freeze()
+    # Build the search index and sort permutations up front so no session
+    # pays for them on a keystroke.
+    store.prepare()
+    return store, report
+
+
+def _fingerprint_at(path: str, offset: int) -> bytes:
+    with open(path, "rb") as file:
+        file.seek(max(offset - FINGERPRINT_SIZE, 0))
+        return file.read(min(offset, FINGERPRINT_SIZE))
+
+
+def _load(path: str, version: int) -> _Entry:
+    """Parse the whole file, remembering where an append would start."""
+    signature = _signature(path)
+    with open(path, "rb") as file:
+        data = file.read()
+    store, report = parse_items(io.BytesIO(data))
+    if report.rejected_count:
+        print(f"Validation of '{path}': {report.summary()}")
+    # Without a final newline the next write may continue the last row, so
+    # the next change reloads the file instead of appending.
+    header = data[: data.find(b"\n") + 1] if data.endswith(b"\n") else b""
+    return _Entry(
+        signature,
+        store,
+        report,
+        version,
+        len(data),
+        header,
+        data[-FINGERPRINT_SIZE:],
+    )
+
+
+def _append(path: str, entry: _Entry) -> Optional[_Entry]:
+    """Parse the lines appended after ``entry``, or return None to reload.
+
+    Returns ``entry`` with a new signature when no complete line was added.
+    """
+    signature = _signature(path)
+    if signature[0] < entry.offset or not entry.header:
+        return None
+    with open(path, "rb") as file:
+        if file.readline() != entry.header:
+            return None
+        if _fingerprint_at(path, entry.offset) != entry.fingerprint:
+            return None
+        file.seek(entry.offset)
+        added = file.read(signature[0] - entry.offset)
+    end = added.rfind(b"\n") + 1
+    if not end:
+        return entry._replace(signature=signature)
+    started = time.perf_counter()
+    store, report = _parse_frame(read_csv(io.BytesIO(entry.header + added[:end])))
+    if report.rejected_count:
+        print(f"Validation of rows appended to '{path}': {report.summary()}")
+    offset = entry.offset + end
+    if not len(store):
+        # Nothing accepted: the snapshot and its version stay as they are.
+        return entry._replace(
+            signature=signature,
+            report=entry.report.extend(report),
+            offset=offset,
+            fingerprint=_fingerprint_at(path, offset),
+        )
+    merged = entry.store.append(store).freeze()
+    print(
+        f"Appended {len(store)} rows from '{path}' "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return _Entry(
+        signature,
+        merged,
+        entry.report.extend(report),
+        entry.version + 1,
+        offset,
+        entry.header,
+        _fingerprint_at(path, offset),
+    )
+
+
+def load_dataset(path: str) -> ItemStore:
+    """Return the shared snapshot of ``path``, parsing only what changed.
+
+    Raises the same errors as parsing the file (``FileNotFoundError``,
+    ``KeyError`` for missing columns and ``ValueError`` for an empty or
+    malformed file); failures are never cached.
+    """
+    key = os.path.abspath(path)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry.signature == _signature(key):
+            _stats["hits"] += 1
+            return entry.store
+        _stats["misses"] += 1
+        loading = _loading.setdefault(key, threading.Lock())
+    with loading:
+        with _lock:
+            entry = _entries.get(key)
+        # Another thread may have parsed the change while this one waited.
+        if entry is not None and entry.signature == _signature(key):
+            return entry.store
+        change = None
+        updated = _append(key, entry) if entry is not None else None
+        if updated is not None:
+            if updated.version != entry.version:
+                change = appended(updated.version, len(entry.store), len(updated.store))
+        elif entry is not None:
+            updated = _load(key, entry.version + 1)
+            change = diff_stores(updated.version, entry.store, updated.store)
+        else:
+            updated = _load(key, 1)
+        with _lock:
+            _entries[key] = updated
+            log = _changes.setdefault(key, ChangeLog())
+            if change is not None:
+                _stats["appends" if change.appended_only else "reloads"] += 1
+                log.record(change)
+        return updated.store
+
+
+def load_snapshot(path: str) -> Tuple[ItemStore, int]:
+    """Return the shared snapshot of ``path`` together with its version."""
+    load_dataset(path)
+    with _lock:
+        entry = _entries[os.path.abspath(path)]
+        return entry.store, entry.version
+
+
+def dataset_version(path: str) -> int:
+    """Return the version of the cached snapshot of ``path``, 0 if not loaded."""
+    with _lock:
+        entry = _entries.get(os.path.abspath(path))
+        return entry.version if entry is not None else 0
+
+
+def dataset_changes(path: str, since: int) -> Optional[List[DatasetChange]]:
+    """Return the changes of ``path`` after version ``since``, oldest first.
+
+    Returns None when they are no longer all known and the caller must
+    treat the dataset as replaced.
+    """
+    with _lock:
+        log = _changes.get(os.path.abspath(path))
+        return log.since(since) if log is not None and since else None
+
+
+def dataset_report(path: str) -> Optional[ValidationReport]:
+    """Return the validation report of the cached snapshot of ``path``."""
+    with _lock:
+        entry = _entries.get(os.path.abspath(path))
+        return entry.report if entry is not None else None
+
+
+def cache_stats() -> Dict[str, int]:
+    """Return the cache counters, the number of cached files and their size in bytes."""
+    with _lock:
+        return {
+            **_stats,
+            "entries": len(_entries),
+            "bytes": sum(entry.store.nbytes for entry in _entries.values()),
+        }
+
+
+def clear_cache():
+    """Drop every cached dataset and reset the counters."""
+    with _lock:
+        _entries.clear()
+        _changes.clear()
+        for key in _stats:
+            _stats[key] = 0
+
+
+_write_lock = threading.Lock()
+
+
+def append_rows(path: str, df: pd.DataFrame):
+    """Append item rows to ``path`` with a single write, creating it if needed.
+
+    The rows are written as one block, so the cache (and any watcher) picks
+    them up as one append instead of one change per row.
+    """
+    key = os.path.abspath(path)
+    data = df.to_csv(header=False, index=False, lineterminator="\n").encode()
+    with _write_lock:
+        with open(key, "ab+") as file:
+            file.seek(0, os.SEEK_END)
+            if not file.tell():
+                data = df.to_csv(index=False, lineterminator="\n").encode()
+            else:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    data = b"\n" + data
+            file.write(data)
+
+
+_watchers: Dict[str, threading.Thread] = {}
+
+
+def _watch(path: str, interval: float):
+    while True:
+        time.sleep(interval)
+        try:
+            load_dataset(path)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Could not reload '{path}': {e}")
+
+
+def start_watcher(path: str, interval: float = 1.0):
+    """Poll ``path`` in a daemon thread and refresh its snapshot on change.
+
+    Only one watcher runs per file, however often this is called.
+    """
+    key = os.path.abspath(path)
+    with _lock:
+        if key in _watchers:
+            return
+        thread = threading.Thread(
+            target=_watch,
+            args=(key, interval),
+            name=f"checklist-watch-{os.path.basename(key)}",
+            daemon=True,
+        )
+        _watchers[key] = thread
+    thread.start()
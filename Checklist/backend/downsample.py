@@ -0,0 +1,39 @@
+"""Downsampling of chart series to a bounded number of points."""
+
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """Return the indices of ``budget`` points chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept. The points between are split into
+    ``budget - 2`` buckets and from each the point forming the largest
+    triangle with the previously kept point and the average of the next
+    bucket is kept, which preserves peaks and troughs.
+    """
+    n = len(x)
+    if budget >= n:
+        return np.arange(n)
+    if budget < 3:
+        return np.array([0, n - 1][:budget], dtype=np.int64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    kept = np.empty(budget, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for i in range(budget - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[stop : edges[i + 2]].mean()
+            next_y = y[stop : edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Twice the triangle areas; the factor does not change the argmax.
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        kept[i + 1] = previous
+    return kept
@@ -0,0 +1,366 @@
+"""Content-addressed storage for task evidence uploads.
+
+Uploaded files are streamed to disk in chunks and hashed while they are
+written. The content lives once under ``objects/<aa>/<sha256>`` no matter
+how many tasks it is attached to; attachments reference it by hash and
+are recorded in an indexed ``EvidenceCatalog``.
+
+The store lives outside the upload dir, which Reflex serves publicly, in
+``evidence/`` or the directory set with ``CHECKLIST_EVIDENCE_DIR``.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import reflex as rx
+
+from .evidence_catalog import EvidenceCatalog, EvidenceRecord
+
+
+# Hashing, writing and fsync run here so the event loop stays responsive.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="checklist-evidence")
+
+CHUNK_SIZE = 1024 * 1024
+
+EVIDENCE_DIR_ENV = "CHECKLIST_EVIDENCE_DIR"
+DEFAULT_EVIDENCE_DIR = "evidence"
+
+# Concurrent evidence writes allowed across the server and per session.
+MAX_SERVER_WRITES = 8
+MAX_SESSION_WRITES = 2
+
+# Partial uploads untouched for this long are abandoned and deleted; the
+# partial directory is swept for them at most once per interval.
+PARTIAL_UPLOAD_TTL = 24 * 60 * 60  # Seconds
+PARTIAL_SWEEP_INTERVAL = 60 * 60  # Seconds
+# Partial uploads are locked by stripe, a fixed set of locks shared by hash.
+UPLOAD_LOCK_STRIPES = 64
+
+_UPLOAD_ID = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+class UploadOffsetError(ValueError):
+    """Raised when a chunk does not start at the acknowledged offset."""
+
+    def __init__(self, offset: int):
+        super().__init__(f"Expected a chunk at offset {offset}.")
+        self.offset = offset
+
+
+class WriteLimiter:
+    """Caps concurrent evidence writes per session and per server."""
+
+    def __init__(self, per_server: int, per_session: int):
+        self.per_session = per_session
+        self._server = asyncio.Semaphore(per_server)
+        self._sessions: Dict[str, Tuple[asyncio.Semaphore, int]] = {}
+
+    @asynccontextmanager
+    async def slot(self, session: str):
+        """Hold one write slot for ``session`` for the duration of the block."""
+        semaphore, users = self._sessions.get(
+            session, (asyncio.Semaphore(self.per_session), 0)
+        )
+        self._sessions[session] = (semaphore, users + 1)
+        try:
+            async with semaphore, self._server:
+                yield
+        finally:
+            semaphore, users = self._sessions[session]
+            if users == 1:
+                del self._sessions[session]
+            else:
+                self._sessions[session] = (semaphore, users - 1)
+
+
+write_limiter = WriteLimiter(MAX_SERVER_WRITES, MAX_SESSION_WRITES)
+
+
+class _PendingObject:
+    """A temp file that hashes what is written to it until it is committed."""
+
+    def __init__(self, directory: Path):
+        fd, name = tempfile.mkstemp(prefix="upload_", dir=directory)
+        self.path = Path(name)
+        self.file = os.fdopen(fd, "wb")
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes):
+        self.hash.update(chunk)
+        self.file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self, objects_dir: Path) -> Tuple[str, int, bool]:
+        """Durably move the content to its hash address, unless already there."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        digest = self.hash.hexdigest()
+        return digest, self.size, _move_to_address(self.path, objects_dir, digest)
+
+    def discard(self):
+        self.file.close()
+        self.path.unlink(missing_ok=True)
+
+
+def _move_to_address(path: Path, objects_dir: Path, digest: str) -> bool:
+    """Move ``path`` to its content address; return False if it was already stored."""
+    target = objects_dir / digest[:2] / digest
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Linking fails if the target exists, so of two writers of the same
+    # content exactly one stores it.
+    try:
+        os.link(path, target)
+        stored = True
+    except FileExistsError:
+        stored = False
+    path.unlink()
+    return stored
+
+
+class EvidenceStore:
+    """Deduplicating evidence store rooted at a directory."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.objects_dir = root / "objects"
+        self.tmp_dir = root / "tmp"
+        self.partial_dir = root / "partial"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
+        self.catalog = EvidenceCatalog(root / "catalog.db")
+        # Attachments recorded before the catalog existed.
+        manifest = root / "attachments.jsonl"
+        if manifest.exists():
+            self.catalog.import_manifest(manifest)
+        # An upload's files are only touched while holding its lock.
+        self._upload_locks = [threading.Lock() for _ in range(UPLOAD_LOCK_STRIPES)]
+        self._swept_at = 0.0
+        self.discard_stale_uploads()
+
+    def object_path(self, sha256: str) -> Path:
+        """Return where the content with hash ``sha256`` is stored."""
+        return self.objects_dir / sha256[:2] / sha256
+
+    async def save(
+        self,
+        task_name: str,
+        upload: rx.UploadFile,
+        chunk_size: int = CHUNK_SIZE,
+        checklist_id: str = "",
+    ) -> EvidenceRecord:
+        """Stream ``upload`` into the store and attach it to ``task_name``.
+
+        ``checklist_id`` names the checklist of the task; ``""`` is the
+        shared items file.
+        """
+        loop = asyncio.get_running_loop()
+        pending = await loop.run_in_executor(_executor, _PendingObject, self.tmp_dir)
+        try:
+            while chunk := await upload.read(chunk_size):
+                await loop.run_in_executor(_executor, pending.write, chunk)
+            digest, size, stored = await loop.run_in_executor(
+                _executor, pending.commit, self.objects_dir
+            )
+        except BaseException:
+            await loop.run_in_executor(_executor, pending.discard)
+            raise
+        record = EvidenceRecord(
+            task_name=task_name,
+            sha256=digest,
+            filename=os.path.basename(upload.filename or digest),
+            content_type=upload.content_type or "application/octet-stream",
+            size=size,
+            uploaded_at=time.time(),
+            stored=stored,
+            checklist_id=checklist_id,
+        )
+        await loop.run_in_executor(_executor, self._attach, record)
+        return record
+
+    async def save_many(
+        self,
+        session: str,
+        task_name: str,
+        uploads: List[rx.UploadFile],
+        checklist_id: str = "",
+    ) -> List[EvidenceRecord]:
+        """Save a batch of uploads, within the session and server write caps."""
+
+        async def save_one(upload: rx.UploadFile) -> EvidenceRecord:
+            async with write_limiter.slot(session):
+                return await self.save(task_name, upload, checklist_id=checklist_id)
+
+        return list(await asyncio.gather(*(save_one(upload) for upload in uploads)))
+
+    # Resumable uploads: a client sends a file as ordered chunks and, after a
+    # dropped connection, asks for the acknowledged offset and continues there.
+
+    def _partial_paths(self, upload_id: str) -> Tuple[Path, Path]:
+        if not _UPLOAD_ID.match(upload_id):
+            raise ValueError(f"Invalid upload id: {upload_id!r}")
+        return (
+            self.partial_dir / f"{upload_id}.part",
+            self.partial_dir / f"{upload_id}.json",
+        )
+
+    def _upload_lock(self, upload_id: str) -> threading.Lock:
+        return self._upload_locks[hash(upload_id) % len(self._upload_locks)]
+
+    def discard_stale_uploads(self, max_age: float = PARTIAL_UPLOAD_TTL) -> int:
+        """Delete partial uploads not written to for ``max_age`` seconds.
+
+        Returns the number of uploads deleted.
+        """
+        now = time.time()
+        self._swept_at = now
+        ids = {
+            path.stem
+            for path in self.partial_dir.iterdir()
+            if _UPLOAD_ID.match(path.stem)
+        }
+        discarded = 0
+        for upload_id in ids:
+            paths = self._partial_paths(upload_id)
+            with self._upload_lock(upload_id):
+                try:
+                    touched = max(path.stat().st_mtime for path in paths if path.exists())
+                except ValueError:
+                    continue
+                if now - touched < max_age:
+                    continue
+                for path in paths:
+                    path.unlink(missing_ok=True)
+            discarded += 1
+        if discarded:
+            print(f"Discarded {discarded} abandoned evidence upload(s)")
+        return discarded
+
+    def begin_upload(
+        self,
+        upload_id: str,
+        task_name: str,
+        filename: str,
+        size: int,
+        checklist_id: str = "",
+    ) -> int:
+        """Start or resume an upload and return the acknowledged offset."""
+        part, meta = self._partial_paths(upload_id)
+        if time.time() - self._swept_at >= PARTIAL_SWEEP_INTERVAL:
+            self.discard_stale_uploads()
+        info = {
+            "checklist_id": checklist_id,
+            "task_name": task_name,
+            "filename": filename,
+            "size": size,
+        }
+        with self._upload_lock(upload_id):
+            if meta.exists() and part.exists():
+                if json.loads(meta.read_text(encoding="utf-8")) == info:
+                    return part.stat().st_size
+            part.write_bytes(b"")
+            meta.write_text(json.dumps(info), encoding="utf-8")
+            return 0
+
+    def append_chunk(self, upload_id: str, offset: int, chunk: bytes) -> int:
+        """Durably append ``chunk`` at ``offset`` and return the new offset.
+
+        The offset is checked and the chunk written under the upload's lock,
+        so a retried chunk racing the original is refused, not appended twice.
+        """
+        part, meta = self._partial_paths(upload_id)
+        with self._upload_lock(upload_id):
+            if not meta.exists():
+                raise FileNotFoundError(upload_id)
+            size = json.loads(meta.read_text(encoding="utf-8"))["size"]
+            with open(part, "ab") as file:
+                current = file.tell()
+                if offset != current or current + len(chunk) > size:
+                    raise UploadOffsetError(current)
+                file.write(chunk)
+                file.flush()
+                os.fsync(file.fileno())
+                return file.tell()
+
+    def complete_upload(self, upload_id: str) -> EvidenceRecord:
+        """Hash a fully received upload, store it and attach it to its task."""
+        part, meta = self._partial_paths(upload_id)
+        with self._upload_lock(upload_id):
+            info = json.loads(meta.read_text(encoding="utf-8"))
+            received = part.stat().st_size
+            if received != info["size"]:
+                raise UploadOffsetError(received)
+            digest = hashlib.sha256()
+            with open(part, "rb") as file:
+                while chunk := file.read(CHUNK_SIZE):
+                    digest.update(chunk)
+            sha256 = digest.hexdigest()
+            stored = _move_to_address(part, self.objects_dir, sha256)
+            meta.unlink()
+        record = EvidenceRecord(
+            task_name=info["task_name"],
+            sha256=sha256,
+            filename=os.path.basename(info["filename"]) or sha256,
+            content_type="application/octet-stream",
+            size=received,
+            uploaded_at=time.time(),
+            stored=stored,
+            checklist_id=info.get("checklist_id", ""),
+        )
+        self._attach(record)
+        return record
+
+    def _attach(self, record: EvidenceRecord):
+        """Record ``record`` in the catalog."""
+        self.catalog.add(record)
+
+    def attachments(
+        self, task_name: Optional[str] = None, checklist_id: Optional[str] = None
+    ) -> List[EvidenceRecord]:
+        """Return the attachments of ``task_name``, or of every task."""
+        return self.catalog.attachments(checklist_id=checklist_id, task_name=task_name)
+
+
+_store: Optional[EvidenceStore] = None
+_store_lock = threading.Lock()
+
+
+def evidence_dir() -> Path:
+    """Return the root directory of the evidence store."""
+    return Path(os.environ.get(EVIDENCE_DIR_ENV, DEFAULT_EVIDENCE_DIR))
+
+
+def evidence_store() -> EvidenceStore:
+    """Return the process-wide evidence store.
+
+    A store left in the upload dir by earlier versions is moved out of it
+    first, so it is no longer downloadable from ``/_upload``.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            root = evidence_dir()
+            legacy = rx.get_upload_dir() / "evidence"
+            if legacy.is_dir() and not root.exists():
+                root.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(legacy, root)
+                print(f"Moved the evidence store from '{legacy}' to '{root}'")
+            _store = EvidenceStore(root)
+        return _store
+
+
+async def run_in_executor(func, *args):
+    """Run a blocking evidence store call on the evidence thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
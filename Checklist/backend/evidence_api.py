@@ -0,0 +1,80 @@
+"""HTTP endpoints for resumable, chunked evidence uploads.
+
+A client first ``POST``s ``/api/evidence/uploads`` with an ``upload_id`` it
+derives from the file (so it can find it again after a dropped connection),
+the task name, the file name, its size and optionally the ``checklist_id``
+of the task; the response holds the offset acknowledged so far. It then ``PUT``s chunks to
+``/api/evidence/uploads/{upload_id}?offset=N`` and finally ``POST``s
+``/api/evidence/uploads/{upload_id}/complete``. A chunk at the wrong offset
+is refused with ``409`` and the offset to resume from.
+
+These endpoints are server-side only: the app's own drop zone still sends
+whole files through ``rx.upload``, and resumable uploads are meant for
+scripts and other clients that speak this protocol. Uploads left
+unfinished for a day are deleted.
+"""
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from .evidence import UploadOffsetError, evidence_store, run_in_executor, write_limiter
+
+PREFIX = "/api/evidence/uploads"
+
+
+def _session(request: Request, upload_id: str) -> str:
+    """Identify the uploading session, for the per-session write cap."""
+    return request.headers.get("reflex-client-token") or upload_id
+
+
+async def begin_upload(request: Request) -> dict:
+    body = await request.json()
+    try:
+        offset = await run_in_executor(
+            evidence_store().begin_upload,
+            str(body["upload_id"]),
+            str(body["task_name"]),
+            str(body["filename"]),
+            int(body["size"]),
+            str(body.get("checklist_id", "")),
+        )
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"offset": offset}
+
+
+async def upload_chunk(upload_id: str, offset: int, request: Request):
+    chunk = await request.body()
+    try:
+        async with write_limiter.slot(_session(request, upload_id)):
+            offset = await run_in_executor(
+                evidence_store().append_chunk, upload_id, offset, chunk
+            )
+    except UploadOffsetError as e:
+        return JSONResponse({"offset": e.offset}, status_code=409)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Unknown upload.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"offset": offset}
+
+
+async def complete_upload(upload_id: str):
+    try:
+        record = await run_in_executor(evidence_store().complete_upload, upload_id)
+    except UploadOffsetError as e:
+        return JSONResponse({"offset": e.offset}, status_code=409)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Unknown upload.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return record._asdict()
+
+
+def register(api: FastAPI):
+    """Add the resumable upload endpoints to the app's API."""
+    api.add_api_route(PREFIX, begin_upload, methods=["POST"])
+    api.add_api_route(f"{PREFIX}/{{upload_id}}", upload_chunk, methods=["PUT"])
+    api.add_api_route(
+        f"{PREFIX}/{{upload_id}}/complete", complete_upload, methods=["POST"]
+    )
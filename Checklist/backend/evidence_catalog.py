@@ -0,0 +1,182 @@
+"""Indexed, on-disk catalog of the evidence attached to each task.
+
+Task names repeat across checklists, so attachments are keyed by the
+checklist id and the task name; the shared items file has the id ``""``.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import sqlalchemy as sa
+
+
+class EvidenceRecord(NamedTuple):
+    """An evidence file attached to a task."""
+
+    task_name: str
+    sha256: str
+    filename: str
+    content_type: str
+    size: int
+    uploaded_at: float
+    # False when identical content was already stored.
+    stored: bool
+    checklist_id: str = ""
+
+
+metadata = sa.MetaData()
+
+attachments_table = sa.Table(
+    "attachments",
+    metadata,
+    sa.Column("checklist_id", sa.String(128), primary_key=True),
+    sa.Column("task_name", sa.String(255), primary_key=True),
+    sa.Column("sha256", sa.String(64), primary_key=True),
+    sa.Column("filename", sa.String(255), nullable=False),
+    # Lower-cased extension without the dot, e.g. "pdf".
+    sa.Column("file_type", sa.String(32), nullable=False),
+    sa.Column("content_type", sa.String(128), nullable=False),
+    sa.Column("size", sa.BigInteger, nullable=False),
+    sa.Column("uploaded_at", sa.Float, nullable=False),
+    sa.Index(
+        "ix_attachments_checklist_task_uploaded",
+        "checklist_id",
+        "task_name",
+        "uploaded_at",
+    ),
+    sa.Index("ix_attachments_type_uploaded", "file_type", "uploaded_at"),
+    sa.Index("ix_attachments_uploaded", "uploaded_at"),
+    sa.Index("ix_attachments_sha256", "sha256"),
+)
+
+
+def file_type(filename: str) -> str:
+    """Return the lower-cased extension of ``filename``, without the dot."""
+    return os.path.splitext(filename)[1].lstrip(".").lower()
+
+
+def _add_checklist_column(engine: sa.engine.Engine):
+    """Rebuild a catalog made before attachments had a checklist id.
+
+    Its attachments belonged to the shared items file, id ``""``.
+    """
+    with engine.begin() as conn:
+        columns = sa.inspect(conn).get_columns("attachments")
+        if any(column["name"] == "checklist_id" for column in columns):
+            return
+        conn.execute(sa.text("ALTER TABLE attachments RENAME TO attachments_old"))
+        for index in sa.inspect(conn).get_indexes("attachments_old"):
+            conn.execute(sa.text(f"DROP INDEX {index['name']}"))
+        metadata.create_all(conn)
+        names = ", ".join(
+            column.name for column in attachments_table.c if column.name != "checklist_id"
+        )
+        conn.execute(
+            sa.text(
+                f"INSERT INTO attachments (checklist_id, {names}) "
+                f"SELECT '', {names} FROM attachments_old"
+            )
+        )
+        conn.execute(sa.text("DROP TABLE attachments_old"))
+    print("Added checklist ids to the evidence catalog")
+
+
+class EvidenceCatalog:
+    """SQLite catalog of attachments, keyed by checklist, task name and content hash."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.engine = sa.create_engine(f"sqlite:///{path}")
+        metadata.create_all(self.engine)
+        _add_checklist_column(self.engine)
+        self._lock = threading.Lock()
+
+    def add(self, record: EvidenceRecord):
+        """Record an attachment; attaching the same content again refreshes it."""
+        values = {
+            "checklist_id": record.checklist_id,
+            "task_name": record.task_name,
+            "sha256": record.sha256,
+            "filename": record.filename,
+            "file_type": file_type(record.filename),
+            "content_type": record.content_type,
+            "size": record.size,
+            "uploaded_at": record.uploaded_at,
+        }
+        key = (
+            (attachments_table.c.checklist_id == record.checklist_id)
+            & (attachments_table.c.task_name == record.task_name)
+            & (attachments_table.c.sha256 == record.sha256)
+        )
+        with self._lock, self.engine.begin() as conn:
+            if conn.execute(attachments_table.update().where(key), values).rowcount:
+                return
+            conn.execute(attachments_table.insert(), values)
+
+    def import_manifest(self, manifest: Path):
+        """Load a JSON-lines attachment manifest and mark it as imported."""
+        with open(manifest, encoding="utf-8") as file:
+            records = [EvidenceRecord(**json.loads(line)) for line in file if line.strip()]
+        for record in records:
+            self.add(record)
+        manifest.rename(manifest.with_suffix(".imported"))
+
+    def attachments(
+        self,
+        checklist_id: Optional[str] = None,
+        task_name: Optional[str] = None,
+        file_type: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[EvidenceRecord]:
+        """Return the attachments matching the filters, newest first."""
+        table = attachments_table
+        query = sa.select(table).order_by(table.c.uploaded_at.desc())
+        if checklist_id is not None:
+            query = query.where(table.c.checklist_id == checklist_id)
+        if task_name is not None:
+            query = query.where(table.c.task_name == task_name)
+        if file_type is not None:
+            query = query.where(table.c.file_type == file_type.lstrip(".").lower())
+        if since is not None:
+            query = query.where(table.c.uploaded_at >= since)
+        if until is not None:
+            query = query.where(table.c.uploaded_at < until)
+        if limit is not None:
+            query = query.limit(limit)
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).all()
+        return [
+            EvidenceRecord(
+                task_name=row.task_name,
+                sha256=row.sha256,
+                filename=row.filename,
+                content_type=row.content_type,
+                size=row.size,
+                uploaded_at=row.uploaded_at,
+                stored=True,
+                checklist_id=row.checklist_id,
+            )
+            for row in rows
+        ]
+
+    def counts(self, checklist_id: str, task_names: Iterable[str]) -> Dict[str, int]:
+        """Return the number of attachments of each task of a checklist, in one query."""
+        names = list(dict.fromkeys(task_names))
+        counts = dict.fromkeys(names, 0)
+        if not names:
+            return counts
+        table = attachments_table
+        query = (
+            sa.select(table.c.task_name, sa.func.count())
+            .where(table.c.checklist_id == checklist_id)
+            .where(table.c.task_name.in_(names))
+            .group_by(table.c.task_name)
+        )
+        with self.engine.connect() as conn:
+            counts.update(conn.execute(query).all())
+        return counts
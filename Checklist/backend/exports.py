@@ -0,0 +1,188 @@
+"""Background exports of checklist data to files served for download."""
+
+import gzip
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import pandas as pd
+import reflex as rx
+from openpyxl import Workbook
+
+
+# Exports run here so they never block the event loop serving other sessions.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="checklist-export")
+
+# Exported files older than this are removed when a new export starts.
+EXPORT_TTL_SECONDS = 3600
+
+EXPORT_SUBDIR = "exports"
+
+
+class ExportProgress:
+    """Row counter shared between an export thread and its event handler."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self._lock = threading.Lock()
+
+    def advance(self, rows: int):
+        with self._lock:
+            self.done += rows
+
+    @property
+    def percent(self) -> int:
+        with self._lock:
+            return 100 if not self.total else min(100, self.done * 100 // self.total)
+
+
+def export_dir() -> Path:
+    """Return the directory exports are written to, inside the upload dir."""
+    path = rx.get_upload_dir() / EXPORT_SUBDIR
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _remove_expired(directory: Path):
+    cutoff = time.time() - EXPORT_TTL_SECONDS
+    for path in directory.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def new_export_file(suffix: str) -> Tuple[Path, str]:
+    """Create a unique export file and return its path and download URL."""
+    directory = export_dir()
+    _remove_expired(directory)
+    fd, name = tempfile.mkstemp(prefix="checklist_", suffix=suffix, dir=directory)
+    os.close(fd)
+    path = Path(name)
+    return path, rx.get_upload_url(f"{EXPORT_SUBDIR}/{path.name}")
+
+
+def write_excel(
+    frames: Iterable[pd.DataFrame],
+    headers: List[str],
+    path: Path,
+    progress: ExportProgress,
+) -> Path:
+    """Stream ``frames`` into an ``.xlsx`` file with openpyxl's write-only mode.
+
+    Rows are appended chunk by chunk, so the whole sheet is never held in
+    memory.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(headers)
+    for frame in frames:
+        for row in frame.itertuples(index=False, name=None):
+            sheet.append(row)
+        progress.advance(len(frame))
+    workbook.save(path)
+    return path
+
+
+def write_csv_gz(
+    frames: Iterable[pd.DataFrame],
+    headers: List[str],
+    path: Path,
+    progress: ExportProgress,
+) -> Path:
+    """Stream ``frames`` into a gzip-compressed CSV file."""
+    with gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6) as file:
+        pd.DataFrame(columns=headers).to_csv(file, index=False)
+        for frame in frames:
+            frame.to_csv(file, index=False, header=False)
+            progress.advance(len(frame))
+    return path
+
+
+def _record_batches(frames: Iterable[pd.DataFrame], headers: List[str]):
+    """Convert export frames to Arrow record batches sharing one schema."""
+    import pyarrow as pa
+
+    schema = None
+    for frame in frames:
+        batch = pa.RecordBatch.from_pandas(frame, schema=schema, preserve_index=False)
+        schema = batch.schema
+        yield batch
+    if schema is None:
+        yield pa.RecordBatch.from_pandas(
+            pd.DataFrame(columns=headers), preserve_index=False
+        )
+
+
+def write_parquet(
+    frames: Iterable[pd.DataFrame],
+    headers: List[str],
+    path: Path,
+    progress: ExportProgress,
+) -> Path:
+    """Stream ``frames`` into a Parquet file, one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for batch in _record_batches(frames, headers):
+            if writer is None:
+                writer = pq.ParquetWriter(path, batch.schema, compression="zstd")
+            writer.write_table(pa.Table.from_batches([batch]))
+            progress.advance(batch.num_rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
+
+
+def write_arrow(
+    frames: Iterable[pd.DataFrame],
+    headers: List[str],
+    path: Path,
+    progress: ExportProgress,
+) -> Path:
+    """Stream ``frames`` into an Arrow IPC file."""
+    import pyarrow as pa
+
+    writer = None
+    try:
+        for batch in _record_batches(frames, headers):
+            if writer is None:
+                writer = pa.ipc.new_file(str(path), batch.schema)
+            writer.write_batch(batch)
+            progress.advance(batch.num_rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
+
+
+# Export format name -> (file suffix, writer).
+EXPORT_FORMATS: Dict[str, Tuple[str, Callable[..., Path]]] = {
+    "xlsx": (".xlsx", write_excel),
+    "csv.gz": (".csv.gz", write_csv_gz),
+    "parquet": (".parquet", write_parquet),
+    "arrow": (".arrow", write_arrow),
+}
+
+
+def format_size(size: int) -> str:
+    """Return a human readable file size."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def submit(writer: Callable[..., Path], *args) -> Future:
+    """Run an export writer on the export thread pool."""
+    return _executor.submit(writer, *args)
@@ -0,0 +1,354 @@
+import reflex as rx
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+from .search_index import SearchIndex, tokenize
+
+
+class Item(rx.Base):
+    """The item class representing a checklist task."""
+
+    name: str
+    payment: float
+    date: str
+    status: str
+    # Position of the item in its store, or -1 when it has none.
+    row: int = -1
+
+
+# Columns that can be searched and sorted, in display order.
+COLUMNS = ["name", "payment", "date", "status"]
+
+# Header names used when the store is exported.
+EXPORT_HEADERS = {
+    "name": "Task Name",
+    "payment": "Payment",
+    "date": "Date",
+    "status": "Status",
+}
+
+
+class ItemStore:
+    """Columnar, array-backed collection of checklist items.
+
+    Each column lives in its own NumPy array and ``status`` is stored as
+    categorical codes, so filtering and sorting work on index vectors and
+    ``Item`` objects are only built for the rows that are displayed.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        payments: Sequence[float],
+        dates: Sequence[str],
+        statuses: Sequence[str],
+        date_value: Optional[np.ndarray] = None,
+    ):
+        self.name = np.asarray(names, dtype=object)
+        self.payment = np.asarray(payments, dtype=np.float64)
+        self.date = np.asarray(dates, dtype=object)
+        self.date_value = parse_dates(self.date) if date_value is None else date_value
+        categories, codes = np.unique(
+            np.asarray(statuses, dtype=object).astype(str), return_inverse=True
+        )
+        self.status_categories: List[str] = categories.tolist()
+        self.status_code = codes.astype(np.int16)
+        self._string_bytes = _string_bytes(self.name) + _string_bytes(self.date)
+        self._search_index: Optional[SearchIndex] = None
+        self._sort_orders: Dict[str, np.ndarray] = {}
+        self._all_rows: Optional[np.ndarray] = None
+
+    @classmethod
+    def empty(cls) -> "ItemStore":
+        """Create a store without rows."""
+        return cls([], [], [], [])
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, date_value: Optional[np.ndarray] = None
+    ) -> "ItemStore":
+        """Create a store from a frame with name, payment, date and status columns."""
+        return cls(
+            df["name"].to_numpy(dtype=object),
+            df["payment"].to_numpy(dtype=np.float64),
+            df["date"].to_numpy(dtype=object),
+            df["status"].to_numpy(dtype=object),
+            date_value,
+        )
+
+    def append(self, other: "ItemStore") -> "ItemStore":
+        """Return a new store with the rows of ``other`` after those of ``self``.
+
+        The search index and the sort permutations built for ``self`` are
+        extended with the new rows instead of being rebuilt.
+        """
+        if not len(other):
+            return self
+        categories = sorted(set(self.status_categories) | set(other.status_categories))
+        position = {category: code for code, category in enumerate(categories)}
+        remap_old = np.array([position[c] for c in self.status_categories], dtype=np.int16)
+        remap_new = np.array([position[c] for c in other.status_categories], dtype=np.int16)
+        store = ItemStore.__new__(ItemStore)
+        store.name = np.concatenate([self.name, other.name])
+        store.payment = np.concatenate([self.payment, other.payment])
+        store.date = np.concatenate([self.date, other.date])
+        store.date_value = np.concatenate([self.date_value, other.date_value])
+        store.status_categories = categories
+        store._string_bytes = self._string_bytes + other._string_bytes
+        store.status_code = np.concatenate(
+            [
+                remap_old[self.status_code] if len(self) else self.status_code,
+                remap_new[other.status_code],
+            ]
+        )
+        store._search_index = None
+        store._sort_orders = {}
+        store._all_rows = None
+        if self._search_index is not None:
+            store._search_index = self._search_index.extend(
+                other.search_columns(), len(self)
+            )
+        for column, order in self._sort_orders.items():
+            store._sort_orders[column] = store._merge_order(column, order, len(self))
+        return store
+
+    def _merge_order(self, column: str, order: np.ndarray, start: int) -> np.ndarray:
+        """Merge the rows from ``start`` into the ascending permutation ``order``."""
+        key = self.sort_key(column)
+        added = start + np.argsort(key[start:], kind="stable")
+        # Insert after equal keys so the merged order stays stable.
+        positions = np.searchsorted(key[order], key[added], side="right")
+        merged = np.insert(order, positions, added)
+        merged.flags.writeable = False
+        return merged
+
+    def freeze(self) -> "ItemStore":
+        """Mark every column read-only so the store can be shared safely."""
+        for column in (
+            self.name,
+            self.payment,
+            self.date,
+            self.date_value,
+            self.status_code,
+        ):
+            column.flags.writeable = False
+        return self
+
+    def __len__(self) -> int:
+        return len(self.payment)
+
+    @property
+    def status(self) -> np.ndarray:
+        """The status column decoded back to strings."""
+        return np.asarray(self.status_categories, dtype=object)[self.status_code]
+
+    def set_status(self, row: int, status: str) -> str:
+        """Change the status of ``row`` in place and return the old one; O(1).
+
+        Statuses are matched through their categories rather than the token
+        index, so the index stays valid; only the status sort order is
+        dropped, to be rebuilt by the next sort on that column.
+        """
+        old = self.status_categories[self.status_code[row]]
+        if status not in self.status_categories:
+            self.status_categories = self.status_categories + [status]
+        writeable = self.status_code.flags.writeable
+        self.status_code.flags.writeable = True
+        self.status_code[row] = self.status_categories.index(status)
+        self.status_code.flags.writeable = writeable
+        self._sort_orders.pop("status", None)
+        return old
+
+    def search_index(self) -> SearchIndex:
+        """The inverted token index over the searchable columns, built once."""
+        if self._search_index is None:
+            self._search_index = SearchIndex.build(self.search_columns())
+        return self._search_index
+
+    def search_columns(self, indices: Optional[np.ndarray] = None) -> List[np.ndarray]:
+        """Return the token-indexed columns, optionally restricted to ``indices``.
+
+        The status is left out: it is matched through its few categories,
+        so it can change without touching the index.
+        """
+        if indices is None:
+            indices = slice(None)
+        return [
+            self.name[indices],
+            self.payment[indices].astype(str),
+            self.date[indices],
+        ]
+
+    def token_rows(self, token: str) -> np.ndarray:
+        """Return the sorted rows having a word, or a status word, starting with ``token``."""
+        rows = self.search_index().prefix_rows(token)
+        codes = [
+            code
+            for code, category in enumerate(self.status_categories)
+            if any(word.startswith(token) for word in tokenize(category))
+        ]
+        if not codes:
+            return rows
+        return np.union1d(rows, np.flatnonzero(np.isin(self.status_code, codes)))
+
+    def contains(self, indices: np.ndarray, phrase: str) -> np.ndarray:
+        """Return a mask of the given rows having ``phrase`` inside one column."""
+        phrase = phrase.lower()
+        # Statuses are categorical, so they are checked once per category.
+        matches = np.array(
+            [phrase in category.lower() for category in self.status_categories],
+            dtype=bool,
+        )
+        if len(matches):
+            mask = matches[self.status_code[indices]]
+        else:
+            mask = np.zeros(len(indices), dtype=bool)
+        for column in (self.name, self.date, self.payment):
+            rest = ~mask
+            if not rest.any():
+                break
+            text = np.char.lower(column[indices[rest]].astype(str))
+            mask[rest] = np.char.find(text, phrase) >= 0
+        return mask
+
+    def search(self, value: str) -> np.ndarray:
+        """Return the indices of the rows matching ``value``.
+
+        Every word of ``value`` must start a word of the row; a query with
+        several words must also appear verbatim in one of the columns.
+        """
+        tokens = tokenize(value)
+        if not tokens:
+            return self.all_rows()
+        rows = self.search_index().search(value, self.token_rows)
+        if len(tokens) > 1 and len(rows):
+            rows = rows[self.contains(rows, " ".join(tokens))]
+        return rows
+
+    def all_rows(self) -> np.ndarray:
+        """Return the read-only indices of every row, shared by all views."""
+        if self._all_rows is None:
+            rows = np.arange(len(self))
+            rows.flags.writeable = False
+            self._all_rows = rows
+        return self._all_rows
+
+    @property
+    def nbytes(self) -> int:
+        """Return the bytes held by the columns, the search index and sort orders.
+
+        The strings of the object columns are measured once, when the store
+        is built, since their arrays only hold pointers.
+        """
+        arrays = [self.name, self.payment, self.date, self.date_value, self.status_code]
+        arrays += list(self._sort_orders.values())
+        if self._search_index is not None:
+            arrays += [
+                self._search_index.vocab,
+                self._search_index.offsets,
+                self._search_index.rows,
+            ]
+        if self._all_rows is not None:
+            arrays.append(self._all_rows)
+        return self._string_bytes + sum(array.nbytes for array in arrays)
+
+    def sort_key(self, column: str) -> np.ndarray:
+        """Return the array used to order rows by ``column``."""
+        if column == "payment":
+            return self.payment
+        if column == "date":
+            return self.date_value
+        if column == "status":
+            ranks = np.argsort(
+                np.argsort([c.lower() for c in self.status_categories], kind="stable")
+            )
+            return ranks[self.status_code] if len(ranks) else self.status_code
+        return np.char.lower(self.name.astype(str))
+
+    def sort_order(self, column: str) -> np.ndarray:
+        """Return the ascending row permutation for ``column``, built once."""
+        order = self._sort_orders.get(column)
+        if order is None:
+            order = np.argsort(self.sort_key(column), kind="stable")
+            order.flags.writeable = False
+            self._sort_orders[column] = order
+        return order
+
+    def prepare(self) -> "ItemStore":
+        """Build the search index and every sort permutation up front."""
+        self.search_index()
+        self.all_rows()
+        for column in COLUMNS:
+            self.sort_order(column)
+        return self
+
+    def filter_sort(
+        self, search_value: str = "", sort_value: str = "", sort_reverse: bool = False
+    ) -> np.ndarray:
+        """Return the row indices matching the search, in sort order.
+
+        Sorting walks the precomputed permutation of the column and keeps
+        the rows selected by the search, so it costs O(n) instead of a sort.
+        Without a search the shared, read-only permutation (or a reversed
+        view of it) is returned; only filtered results are new arrays.
+        """
+        indices = self.search(search_value)
+        if sort_value not in COLUMNS or not len(indices):
+            return indices
+        order = self.sort_order(sort_value)
+        if len(indices) < len(self):
+            selected = np.zeros(len(self), dtype=bool)
+            selected[indices] = True
+            order = order[selected[order]]
+        return order[::-1] if sort_reverse else order
+
+    def items_at(self, indices: Sequence[int]) -> List[Item]:
+        """Build ``Item`` objects for the given row indices."""
+        status = self.status_categories
+        return [
+            Item(
+                name=str(self.name[i]),
+                payment=float(self.payment[i]),
+                date=str(self.date[i]),
+                status=status[self.status_code[i]],
+                row=int(i),
+            )
+            for i in indices
+        ]
+
+    def to_frame(self, indices: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Build an export frame for the given row indices."""
+        if indices is None:
+            indices = np.arange(len(self))
+        return pd.DataFrame(
+            {
+                EXPORT_HEADERS["name"]: self.name[indices],
+                EXPORT_HEADERS["payment"]: self.payment[indices],
+                EXPORT_HEADERS["date"]: self.date[indices],
+                EXPORT_HEADERS["status"]: self.status[indices],
+            }
+        )
+
+
+def _string_bytes(column: np.ndarray) -> int:
+    """Return the bytes of the objects referenced by an object ``column``."""
+    deep = pd.Series(column, copy=False).memory_usage(deep=True, index=False)
+    return int(deep) - column.nbytes
+
+
+def parse_dates(dates: np.ndarray) -> np.ndarray:
+    """Parse ISO date strings to ``datetime64[D]``, using NaT for invalid values."""
+    parsed = pd.to_datetime(
+        pd.Series(dates, dtype=object), format="%Y-%m-%d", errors="coerce"
+    )
+    return parsed.to_numpy(dtype="datetime64[D]")
+
+
+def read_csv(path: str) -> pd.DataFrame:
+    """Read an items CSV file into a frame of raw column values."""
+    return pd.read_csv(
+        path,
+        dtype={"name": str, "date": str, "status": str},
+        keep_default_na=False,
+    )
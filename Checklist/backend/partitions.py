@@ -0,0 +1,205 @@
+"""Items partitioned by checklist, loaded lazily into a process-wide LRU.
+
+The items of each checklist live in their own file under ``checklists/``.
+A partition is parsed only when a session opens that checklist and is then
+shared by every session. Least recently used partitions are evicted once
+the parsed stores exceed the memory budget, which can be set in bytes with
+``CHECKLIST_PARTITION_BUDGET``.
+
+Status changes are made to the loaded store and appended to a status log
+next to the items file, which is replayed whenever the items are parsed.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import pandas as pd
+
+from .dataset_cache import append_rows, parse_items
+from .item_store import COLUMNS, ItemStore
+
+
+PARTITIONS_DIR = "checklists"
+
+PARTITION_BUDGET_ENV = "CHECKLIST_PARTITION_BUDGET"
+DEFAULT_PARTITION_BUDGET = 256 * 1024 * 1024
+
+
+class _Partition(NamedTuple):
+    signature: Tuple[int, int]
+    store: ItemStore
+
+
+# Most recently used last.
+_partitions: "OrderedDict[str, _Partition]" = OrderedDict()
+_bytes = 0
+_lock = threading.Lock()
+# One parser per partition at a time, by checklist id.
+_loading: Dict[str, threading.Lock] = {}
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+# Called with the id of each evicted partition, outside the lock.
+_evict_listeners: List[Callable[[str], None]] = []
+# Serializes status changes and the appends to the status logs.
+_write_lock = threading.Lock()
+
+
+def partition_budget() -> int:
+    """Return the memory budget of the loaded partitions in bytes."""
+    return int(os.environ.get(PARTITION_BUDGET_ENV, DEFAULT_PARTITION_BUDGET))
+
+
+def partition_path(checklist_id: str) -> str:
+    """Return the items file of the checklist ``checklist_id``."""
+    return os.path.join(PARTITIONS_DIR, f"{checklist_id}.csv")
+
+
+def status_log_path(checklist_id: str) -> str:
+    """Return the log of the status changes of the checklist ``checklist_id``."""
+    return os.path.join(PARTITIONS_DIR, f"{checklist_id}.status")
+
+
+def _replay_status_log(checklist_id: str, store: ItemStore):
+    """Apply the logged status changes to a freshly parsed ``store``.
+
+    Each line holds a row and its new status, so replaying a line twice is
+    harmless; an incomplete last line is skipped.
+    """
+    try:
+        with open(status_log_path(checklist_id), encoding="utf-8") as file:
+            lines = file.read().split("\n")
+    except FileNotFoundError:
+        return
+    for line in lines:
+        row, _, status = line.partition(",")
+        if row.isdigit() and status and int(row) < len(store):
+            store.set_status(int(row), status)
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def on_evict(listener: Callable[[str], None]):
+    """Call ``listener`` with the id of every partition evicted from now on.
+
+    Holders of a partition's store should drop it then, or it stays in
+    memory after leaving the budget.
+    """
+    _evict_listeners.append(listener)
+
+
+def _evict(keep: str) -> List[str]:
+    """Drop least recently used partitions, other than ``keep``, over the budget.
+
+    Returns the ids of the evicted partitions.
+    """
+    global _bytes
+    budget = partition_budget()
+    evicted = []
+    for checklist_id in list(_partitions):
+        if _bytes <= budget:
+            break
+        if checklist_id == keep:
+            continue
+        _bytes -= _partitions.pop(checklist_id).store.nbytes
+        _stats["evictions"] += 1
+        evicted.append(checklist_id)
+        print(f"Evicted checklist partition '{checklist_id}': {_partition_stats()}")
+    return evicted
+
+
+def load_partition(checklist_id: str) -> ItemStore:
+    """Return the shared items of the checklist ``checklist_id``.
+
+    The partition is parsed on first use and again after its file changed,
+    with the status changes of its log applied.
+
+    Raises:
+        FileNotFoundError: If the checklist has no items file.
+        KeyError: If a required column is missing.
+    """
+    global _bytes
+    path = partition_path(checklist_id)
+    signature = _signature(path)
+    with _lock:
+        partition = _partitions.get(checklist_id)
+        if partition is not None and partition.signature == signature:
+            _partitions.move_to_end(checklist_id)
+            _stats["hits"] += 1
+            return partition.store
+        _stats["misses"] += 1
+        loading = _loading.setdefault(checklist_id, threading.Lock())
+    # Parse outside the lock so other partitions stay available meanwhile.
+    with loading:
+        signature = _signature(path)
+        with _lock:
+            partition = _partitions.get(checklist_id)
+        # Another thread may have parsed the partition while this one waited.
+        if partition is not None and partition.signature == signature:
+            return partition.store
+        store, report = parse_items(path)
+        if report.rejected_count:
+            print(f"Validation of '{path}': {report.summary()}")
+        _replay_status_log(checklist_id, store)
+        with _lock:
+            previous = _partitions.pop(checklist_id, None)
+            if previous is not None:
+                _bytes -= previous.store.nbytes
+            _partitions[checklist_id] = _Partition(signature, store)
+            _bytes += store.nbytes
+            evicted = _evict(checklist_id)
+    for evicted_id in evicted:
+        for listener in _evict_listeners:
+            listener(evicted_id)
+    return store
+
+
+def add_items(checklist_id: str, df: pd.DataFrame):
+    """Append the item rows of ``df`` to the partition of ``checklist_id`` at once."""
+    os.makedirs(PARTITIONS_DIR, exist_ok=True)
+    append_rows(partition_path(checklist_id), df[COLUMNS])
+
+
+def set_status(checklist_id: str, row: int, status: str) -> str:
+    """Set the status of item ``row`` of a checklist and return its old status.
+
+    ``row`` numbers the accepted rows, as in the loaded store. The shared
+    store is changed in place and one line is appended to the status log;
+    the items file is left as it is.
+
+    Raises the errors of ``load_partition``.
+    """
+    store = load_partition(checklist_id)
+    with _write_lock:
+        old = store.set_status(row, status)
+        with open(status_log_path(checklist_id), "a", encoding="utf-8") as file:
+            file.write(f"{row},{status}\n")
+    return old
+
+
+def _partition_stats() -> Dict[str, int]:
+    return {
+        **_stats,
+        "entries": len(_partitions),
+        "bytes": _bytes,
+        "budget": partition_budget(),
+    }
+
+
+def partition_stats() -> Dict[str, int]:
+    """Return the hit, miss and eviction counts and the loaded partitions' size."""
+    with _lock:
+        return _partition_stats()
+
+
+def clear_partitions():
+    """Drop every loaded partition and reset the counters."""
+    global _bytes
+    with _lock:
+        _partitions.clear()
+        _bytes = 0
+        for key in _stats:
+            _stats[key] = 0
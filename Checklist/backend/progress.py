@@ -0,0 +1,44 @@
+"""Numeric progress of checklists, kept as done/total item counters."""
+
+import re
+from typing import Any, Dict
+
+COMPLETED = "Completed"
+
+
+def checklist_id(name: str) -> str:
+    """Return the identifier of the checklist ``name``, safe to use in file names."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def progress_percent(done: int, total: int) -> int:
+    """Return the completed share of a checklist as a whole percentage."""
+    return done * 100 // total if total else 0
+
+
+def checklist_status(done: int, total: int) -> str:
+    """Return the status of a checklist from its counters."""
+    if total and done == total:
+        return "Completed"
+    return "In Progress" if done else "Pending"
+
+
+def summary(name: str, owner: str, done: int, total: int) -> Dict[str, Any]:
+    """Build a checklist summary from its counters."""
+    return {
+        "Id": checklist_id(name),
+        "Name": name,
+        "Owner": owner,
+        "Status": checklist_status(done, total),
+        "Done": done,
+        "Total": total,
+        "Progress": progress_percent(done, total),
+    }
+
+
+def record_status_change(checklist: Dict[str, Any], old_status: str, new_status: str):
+    """Update a checklist summary in place after one item changed status; O(1)."""
+    done = checklist["Done"] + (new_status == COMPLETED) - (old_status == COMPLETED)
+    checklist["Done"] = done
+    checklist["Progress"] = progress_percent(done, checklist["Total"])
+    checklist["Status"] = checklist_status(done, checklist["Total"])
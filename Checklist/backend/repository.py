@@ -0,0 +1,332 @@
+"""Pluggable item repositories behind the checklist table.
+
+``StoreRepository`` serves the shared in-memory ``ItemStore`` parsed from
+``items.csv``. ``SqlItemRepository`` keeps the items in a database and pushes
+filtering, sorting and keyset pagination down into SQL. Set
+``CHECKLIST_DATABASE_URL`` (e.g. ``sqlite:///checklist.db``) to use it.
+"""
+
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+
+from .dataset_cache import load_dataset, start_watcher
+from .item_store import COLUMNS, EXPORT_HEADERS, Item, ItemStore, read_csv
+from .search_index import tokenize
+from .validation import validate_columns
+
+
+DATABASE_URL_ENV = "CHECKLIST_DATABASE_URL"
+
+
+class ItemView:
+    """The filtered and sorted rows of a repository, read a page at a time."""
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def page(self, offset: int, limit: int) -> List[Item]:
+        """Return the items of the rows ``offset`` to ``offset + limit``."""
+        raise NotImplementedError
+
+    def iter_frames(self, chunk_size: int = 10_000) -> Iterator[pd.DataFrame]:
+        """Yield the rows of the view as export frames of ``chunk_size`` rows."""
+        raise NotImplementedError
+
+    def private_bytes(self) -> int:
+        """Return the memory held by this view alone, not shared with others."""
+        return 0
+
+
+class ItemRepository:
+    """A source of checklist items that can be searched, sorted and paged."""
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def view(
+        self, search_value: str = "", sort_value: str = "", sort_reverse: bool = False
+    ) -> ItemView:
+        """Return the rows matching ``search_value`` in the requested order."""
+        raise NotImplementedError
+
+
+class StoreView(ItemView):
+    """A view over an ``ItemStore`` held as a vector of row indices.
+
+    The store is a snapshot shared by every session, in which only the
+    statuses of a checklist's items change in place. Unfiltered
+    views reuse its read-only permutations; only a search produces indices
+    owned by the view.
+    """
+
+    def __init__(self, store: ItemStore, indices: np.ndarray):
+        self.store = store
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def page(self, offset: int, limit: int) -> List[Item]:
+        return self.store.items_at(self.indices[offset : offset + limit])
+
+    def iter_frames(self, chunk_size: int = 10_000) -> Iterator[pd.DataFrame]:
+        for start in range(0, len(self.indices), chunk_size):
+            yield self.store.to_frame(self.indices[start : start + chunk_size])
+
+    def private_bytes(self) -> int:
+        # Arrays shared through the store are read-only.
+        return self.indices.nbytes if self.indices.flags.writeable else 0
+
+
+class StoreRepository(ItemRepository):
+    """Repository over an in-memory, columnar ``ItemStore``."""
+
+    def __init__(self, store: ItemStore):
+        self.store = store
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def view(
+        self, search_value: str = "", sort_value: str = "", sort_reverse: bool = False
+    ) -> StoreView:
+        return StoreView(
+            self.store, self.store.filter_sort(search_value, sort_value, sort_reverse)
+        )
+
+
+metadata = sa.MetaData()
+
+items_table = sa.Table(
+    "items",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("name", sa.String(255), nullable=False),
+    sa.Column("payment", sa.Float, nullable=False),
+    # ISO dates sort chronologically as strings and keep their display form.
+    sa.Column("date", sa.String(10), nullable=False),
+    sa.Column("status", sa.String(32), nullable=False),
+    # Composite indexes with the primary key back the keyset pagination.
+    sa.Index("ix_items_status", "status", "id"),
+    sa.Index("ix_items_date", "date", "id"),
+    sa.Index("ix_items_payment", "payment", "id"),
+    sa.Index("ix_items_name", "name", "id"),
+)
+
+_engines: Dict[str, sa.engine.Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(url: str) -> sa.engine.Engine:
+    """Return the pooled engine for ``url``, shared by every session."""
+    with _engines_lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = sa.create_engine(url, pool_pre_ping=True)
+            metadata.create_all(engine)
+            _engines[url] = engine
+        return engine
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_clause(search_value: str):
+    """Translate a search into SQL with the semantics of ``ItemStore.search``."""
+    tokens = tokenize(search_value)
+    if not tokens:
+        return None
+    columns = [
+        sa.func.lower(items_table.c.name),
+        sa.cast(items_table.c.payment, sa.String),
+        items_table.c.date,
+        sa.func.lower(items_table.c.status),
+    ]
+    clauses = []
+    for token in tokens:
+        token = _like_escape(token)
+        clauses.append(
+            sa.or_(
+                *(
+                    sa.or_(
+                        column.like(f"{token}%", escape="\\"),
+                        column.like(f"% {token}%", escape="\\"),
+                    )
+                    for column in columns
+                )
+            )
+        )
+    if len(tokens) > 1:
+        phrase = _like_escape(" ".join(tokens))
+        clauses.append(
+            sa.or_(*(column.like(f"%{phrase}%", escape="\\") for column in columns))
+        )
+    return sa.and_(*clauses)
+
+
+class SqlView(ItemView):
+    """A filtered and sorted query over the items table.
+
+    Pages are fetched with keyset (seek) pagination: the sort key of the
+    rows bordering every fetched page is remembered, so moving to the next
+    or previous page seeks through the index instead of using ``OFFSET``.
+    Jumps to a page without a known neighbour fall back to ``OFFSET``.
+    """
+
+    # Number of page borders remembered per view.
+    max_bounds = 64
+
+    def __init__(
+        self,
+        url: str,
+        search_value: str = "",
+        sort_value: str = "",
+        sort_reverse: bool = False,
+    ):
+        self.url = url
+        self.search_value = search_value
+        self.sort_value = sort_value if sort_value in COLUMNS else ""
+        # Like ``ItemStore.filter_sort``, the order only reverses a sort.
+        self.sort_reverse = sort_reverse and bool(self.sort_value)
+        # Sort key of the row just before / at the given offset.
+        self._after: Dict[int, Tuple] = {}
+        self._first: Dict[int, Tuple] = {}
+        with get_engine(url).connect() as conn:
+            self._count = conn.execute(
+                self._select(sa.func.count()).order_by(None)
+            ).scalar_one()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _key_columns(self) -> List[sa.Column]:
+        if self.sort_value:
+            return [items_table.c[self.sort_value], items_table.c.id]
+        return [items_table.c.id]
+
+    def _select(self, *columns) -> sa.Select:
+        query = sa.select(*columns).select_from(items_table)
+        clause = _search_clause(self.search_value)
+        return query.where(clause) if clause is not None else query
+
+    def _ordered(self, backwards: bool = False) -> sa.Select:
+        keys = self._key_columns()
+        descending = self.sort_reverse != backwards
+        query = self._select(*items_table.c)
+        return query.order_by(*(key.desc() if descending else key for key in keys))
+
+    def _seek(self, key: Tuple, backwards: bool = False) -> sa.Select:
+        keys = sa.tuple_(*self._key_columns())
+        if self.sort_reverse != backwards:
+            return self._ordered(backwards).where(keys < sa.tuple_(*key))
+        return self._ordered(backwards).where(keys > sa.tuple_(*key))
+
+    def _row_key(self, row) -> Tuple:
+        return tuple(row._mapping[column.name] for column in self._key_columns())
+
+    def page(self, offset: int, limit: int) -> List[Item]:
+        backwards = False
+        if offset == 0:
+            query = self._ordered().limit(limit)
+        elif offset in self._after:
+            query = self._seek(self._after[offset]).limit(limit)
+        elif offset + limit in self._first:
+            query = self._seek(self._first[offset + limit], backwards=True).limit(limit)
+            backwards = True
+        else:
+            query = self._ordered().offset(offset).limit(limit)
+        with get_engine(self.url).connect() as conn:
+            rows = conn.execute(query).all()
+        if backwards:
+            rows.reverse()
+        if rows:
+            if len(self._after) > self.max_bounds:
+                self._after.clear()
+                self._first.clear()
+            self._first[offset] = self._row_key(rows[0])
+            self._after[offset + len(rows)] = self._row_key(rows[-1])
+        return [
+            Item(name=row.name, payment=row.payment, date=row.date, status=row.status)
+            for row in rows
+        ]
+
+    def iter_frames(self, chunk_size: int = 10_000) -> Iterator[pd.DataFrame]:
+        key: Optional[Tuple] = None
+        with get_engine(self.url).connect() as conn:
+            while True:
+                query = self._ordered() if key is None else self._seek(key)
+                rows = conn.execute(query.limit(chunk_size)).all()
+                if not rows:
+                    return
+                key = self._row_key(rows[-1])
+                yield pd.DataFrame(
+                    {
+                        EXPORT_HEADERS[column]: [row._mapping[column] for row in rows]
+                        for column in COLUMNS
+                    }
+                )
+
+
+class SqlItemRepository(ItemRepository):
+    """Repository storing the items in a SQL database.
+
+    Only the database URL is kept on the instance; the pooled engine is
+    shared process-wide through ``get_engine``.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        get_engine(url)
+
+    def __len__(self) -> int:
+        with get_engine(self.url).connect() as conn:
+            return conn.execute(
+                sa.select(sa.func.count()).select_from(items_table)
+            ).scalar_one()
+
+    def view(
+        self, search_value: str = "", sort_value: str = "", sort_reverse: bool = False
+    ) -> SqlView:
+        return SqlView(self.url, search_value, sort_value, sort_reverse)
+
+    def import_csv(self, path: str, chunk_size: int = 10_000) -> int:
+        """Replace the stored items with the valid rows of a CSV file.
+
+        Rows are inserted in batches inside a single transaction.
+        """
+        df = read_csv(path)
+        report, payment, _ = validate_columns(df)
+        df["payment"] = payment
+        df = df[report.accepted][COLUMNS]
+        with get_engine(self.url).begin() as conn:
+            conn.execute(items_table.delete())
+            for start in range(0, len(df), chunk_size):
+                conn.execute(
+                    items_table.insert(),
+                    df.iloc[start : start + chunk_size].to_dict("records"),
+                )
+        return len(df)
+
+
+def get_repository(path: str) -> ItemRepository:
+    """Return the repository configured for the items file at ``path``.
+
+    With ``CHECKLIST_DATABASE_URL`` set, the database is used and seeded from
+    ``path`` while it is empty; otherwise the shared CSV snapshot is used and
+    the file is watched for appended rows.
+    """
+    url = os.environ.get(DATABASE_URL_ENV)
+    if not url:
+        store = load_dataset(path)
+        start_watcher(path)
+        return StoreRepository(store)
+    repository = SqlItemRepository(url)
+    if not len(repository) and os.path.exists(path):
+        repository.import_csv(path)
+    return repository
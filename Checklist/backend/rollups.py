@@ -0,0 +1,237 @@
+"""Running totals of the item data per time bucket.
+
+The totals are built once per dataset and then kept in step with it: rows
+appended, updated or deleted since the last snapshot are added to or
+subtracted from their buckets instead of aggregating every row again.
+"""
+
+import datetime
+import os
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .change_feed import DatasetChange
+from .dataset_cache import dataset_changes, load_snapshot
+from .downsample import lttb
+from .item_store import ItemStore
+
+
+COMPLETED_STATUS = "Completed"
+
+# Period name -> NumPy datetime unit of its buckets; weeks start on Monday.
+PERIODS = {"day": "D", "week": "W", "month": "M", "year": "Y"}
+
+# strftime format of the bucket labels of each period.
+LABEL_FORMATS = {"day": "%Y-%m-%d", "week": "%Y-%m-%d", "month": "%Y-%m", "year": "%Y"}
+
+# Chart series name -> column of the bucket totals.
+SERIES = {"Items": 0, "Payments": 1, "Completed": 2}
+
+
+class Totals(NamedTuple):
+    """Aggregates of the items in one time bucket."""
+
+    count: int
+    payment: float
+    completed: int
+
+
+class BucketTotals:
+    """Item count, payment sum and completed count per time bucket.
+
+    Buckets are numbered like NumPy datetimes of ``unit`` (e.g. ``"M"``
+    counts months since 1970-01), except that weeks start on Monday.
+    """
+
+    def __init__(self, unit: str):
+        self.unit = unit
+        self._totals: Dict[int, List[float]] = {}
+
+    def bucket(self, dates: np.ndarray) -> np.ndarray:
+        """Return the bucket number of each date."""
+        if self.unit == "W":
+            # 1970-01-01 is a Thursday; count weeks from Monday 1969-12-29.
+            return (dates.astype("datetime64[D]").astype(np.int64) + 3) // 7
+        return dates.astype(f"datetime64[{self.unit}]").astype(np.int64)
+
+    def start(self, buckets: np.ndarray) -> np.ndarray:
+        """Return the first day of each bucket."""
+        if self.unit == "W":
+            return (buckets * 7 - 3).astype("datetime64[D]")
+        return buckets.astype(f"datetime64[{self.unit}]").astype("datetime64[D]")
+
+    def series(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the sorted bucket numbers and their totals as an (n, 3) array."""
+        buckets = np.array(sorted(self._totals), dtype=np.int64)
+        totals = np.array(
+            [self._totals[bucket] for bucket in buckets.tolist()], dtype=np.float64
+        ).reshape(-1, 3)
+        return buckets, totals
+
+    def add(self, store: ItemStore, rows: np.ndarray, sign: int = 1):
+        """Add (or with ``sign=-1`` subtract) ``rows`` of ``store`` to their buckets."""
+        dates = store.date_value[rows]
+        valid = ~np.isnat(dates)
+        rows = rows[valid]
+        if not len(rows):
+            return
+        buckets, inverse = np.unique(self.bucket(dates[valid]), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(buckets))
+        payments = np.bincount(inverse, store.payment[rows], minlength=len(buckets))
+        completed = np.bincount(
+            inverse, _completed(store, rows), minlength=len(buckets)
+        )
+        for bucket, count, payment, done in zip(
+            buckets.tolist(), counts.tolist(), payments.tolist(), completed.tolist()
+        ):
+            totals = self._totals.setdefault(bucket, [0, 0.0, 0])
+            totals[0] += sign * count
+            totals[1] += sign * payment
+            totals[2] += sign * int(done)
+            if not totals[0]:
+                del self._totals[bucket]
+
+    def get(self, bucket: int) -> Totals:
+        """Return the totals of ``bucket``; empty buckets are all zero."""
+        count, payment, completed = self._totals.get(bucket, (0, 0.0, 0))
+        return Totals(int(count), round(payment, 2), int(completed))
+
+
+def _completed(store: ItemStore, rows: np.ndarray) -> np.ndarray:
+    if COMPLETED_STATUS not in store.status_categories:
+        return np.zeros(len(rows))
+    code = store.status_categories.index(COMPLETED_STATUS)
+    return (store.status_code[rows] == code).astype(np.float64)
+
+
+class DatasetRollups:
+    """The bucket totals of one dataset snapshot."""
+
+    def __init__(self, store: ItemStore, version: int):
+        self.store = store
+        self.version = version
+        self.periods = {period: BucketTotals(unit) for period, unit in PERIODS.items()}
+        self.months = self.periods["month"]
+        rows = np.arange(len(store))
+        for buckets in self._buckets():
+            buckets.add(store, rows)
+        # Chart points of each period, rebuilt from the buckets after a change.
+        self._points: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        # Downsampled points by (series, period, point budget).
+        self._downsampled: Dict[Tuple[str, str, int], List[Dict[str, Any]]] = {}
+
+    def _buckets(self) -> List[BucketTotals]:
+        return list(self.periods.values())
+
+    def chart_points(self, period: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the ``{"Date": label, series: value}`` points of every series.
+
+        Points are built from the bucket totals once per period and version.
+        """
+        points = self._points.get(period)
+        if points is None:
+            buckets = self.periods[period]
+            numbers, totals = buckets.series()
+            labels = [
+                day.strftime(LABEL_FORMATS[period])
+                for day in buckets.start(numbers).astype(datetime.date)
+            ]
+            points = {}
+            for name, column in SERIES.items():
+                values = totals[:, column].tolist()
+                if name != "Payments":
+                    values = [int(value) for value in values]
+                points[name] = [
+                    {"Date": label, name: round(value, 2)}
+                    for label, value in zip(labels, values)
+                ]
+            self._points[period] = points
+        return points
+
+    def downsampled(
+        self, series: str, period: str, budget: int
+    ) -> List[Dict[str, Any]]:
+        """Return the points of ``series`` reduced to ``budget`` points with LTTB."""
+        key = (series, period, budget)
+        points = self._downsampled.get(key)
+        if points is None:
+            points = self.chart_points(period)[series]
+            if len(points) > budget:
+                numbers, totals = self.periods[period].series()
+                kept = lttb(numbers, totals[:, SERIES[series]], budget)
+                points = [points[i] for i in kept.tolist()]
+            self._downsampled[key] = points
+        return points
+
+    def apply(self, store: ItemStore, change: DatasetChange):
+        """Move the totals from the current snapshot to ``store`` after ``change``."""
+        for buckets in self._buckets():
+            buckets.add(self.store, change.deleted, -1)
+            buckets.add(self.store, change.replaced, -1)
+            buckets.add(store, change.inserted)
+            buckets.add(store, change.updated)
+        self._points = {}
+        self._downsampled = {}
+        self.store = store
+        self.version = change.version
+
+
+_rollups: Dict[str, DatasetRollups] = {}
+_lock = threading.Lock()
+
+
+def dataset_rollups(path: str) -> DatasetRollups:
+    """Return the rollups of the current snapshot of ``path``.
+
+    Changes are applied incrementally when the change log covers them: any
+    number of appends, or one reload diffed against the previous snapshot.
+    Otherwise the totals are rebuilt.
+    """
+    key = os.path.abspath(path)
+    store, version = load_snapshot(key)
+    with _lock:
+        rollups = _rollups.get(key)
+        if rollups is not None and rollups.version == version:
+            return rollups
+        changes = (
+            dataset_changes(key, rollups.version) if rollups is not None else None
+        )
+        if changes is not None:
+            changes = [change for change in changes if change.version <= version]
+        if (
+            changes
+            and changes[-1].version == version
+            and (all(change.appended_only for change in changes) or len(changes) == 1)
+        ):
+            for change in changes:
+                rollups.apply(store, change)
+        else:
+            rollups = DatasetRollups(store, version)
+        _rollups[key] = rollups
+        return rollups
+
+
+def month_over_month(path: str, day: datetime.date) -> Tuple[Totals, Totals]:
+    """Return the totals of the month of ``day`` and of the month before it."""
+    months = dataset_rollups(path).months
+    month = int(months.bucket(np.array([day], dtype="datetime64[D]"))[0])
+    with _lock:
+        return months.get(month), months.get(month - 1)
+
+
+def chart_points(
+    path: str, period: str, budget: Optional[int] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Return the chart points of every series of ``path`` for ``period``.
+
+    With a ``budget``, each series is downsampled to at most that many points.
+    """
+    rollups = dataset_rollups(path)
+    with _lock:
+        if budget is None:
+            return rollups.chart_points(period)
+        return {
+            series: rollups.downsampled(series, period, budget) for series in SERIES
+        }
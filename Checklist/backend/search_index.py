@@ -0,0 +1,144 @@
+"""Inverted token index used by the checklist table search."""
+
+from itertools import chain
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def tokenize(value: str) -> List[str]:
+    """Split a search query into lower-cased, whitespace separated tokens."""
+    return value.lower().split()
+
+
+class SearchIndex:
+    """Sorted token vocabulary with row-id postings, stored as flat arrays.
+
+    Postings of token ``i`` are ``rows[offsets[i]:offsets[i + 1]]`` and are
+    sorted by row. Because the vocabulary is sorted, every token sharing a
+    prefix sits in one contiguous range, so a prefix lookup is two binary
+    searches and one slice. The arrays are read-only, so those slices can be
+    handed to every session without copying.
+    """
+
+    def __init__(self, vocab: np.ndarray, offsets: np.ndarray, rows: np.ndarray):
+        for array in (vocab, offsets, rows):
+            array.flags.writeable = False
+        self.vocab = vocab
+        self.offsets = offsets
+        self.rows = rows
+
+    @classmethod
+    def build(cls, columns: Sequence[np.ndarray], start: int = 0) -> "SearchIndex":
+        """Index the searchable ``columns`` of a set of rows numbered from ``start``.
+
+        Each column is factorized first, so a value repeated on many rows
+        (a status, a date) is tokenized only once.
+        """
+        tokens, token_counts, all_rows = [], [], []
+        for column in columns:
+            codes, uniques = pd.factorize(np.asarray(column, dtype=object))
+            value_tokens = [str(value).lower().split() for value in uniques.tolist()]
+            lengths = np.fromiter(
+                map(len, value_tokens), dtype=np.int64, count=len(uniques)
+            )
+            tokens.append(chain.from_iterable(value_tokens))
+            # Every row contributes one (token, row) pair per token of its value.
+            value_starts = np.cumsum(lengths) - lengths
+            row_lengths = lengths[codes]
+            row_starts = np.cumsum(row_lengths) - row_lengths
+            within = np.arange(int(row_lengths.sum())) - np.repeat(row_starts, row_lengths)
+            token_counts.append(len(value_tokens) and int(lengths.sum()))
+            all_rows.append(
+                (
+                    np.repeat(value_starts[codes], row_lengths) + within,
+                    np.repeat(np.arange(len(codes), dtype=np.int64) + start, row_lengths),
+                )
+            )
+        flat = np.fromiter(chain.from_iterable(tokens), dtype=object, count=sum(token_counts))
+        if not len(flat):
+            return cls.empty()
+        token_ids, vocab = pd.factorize(flat, sort=True)
+        ids, rows, base = [], [], 0
+        for count, (positions, column_rows) in zip(token_counts, all_rows):
+            ids.append(token_ids[base + positions])
+            rows.append(column_rows)
+            base += count
+        return cls._from_ids(
+            vocab.astype(str), np.concatenate(ids), np.concatenate(rows)
+        )
+
+    @classmethod
+    def empty(cls) -> "SearchIndex":
+        return cls(
+            np.array([], dtype=str),
+            np.zeros(1, dtype=np.int64),
+            np.array([], dtype=np.int64),
+        )
+
+    @classmethod
+    def _from_ids(
+        cls, vocab: np.ndarray, token_ids: np.ndarray, rows: np.ndarray
+    ) -> "SearchIndex":
+        """Build the index from a sorted vocabulary and (token id, row) pairs."""
+        order = np.lexsort((rows, token_ids))
+        token_ids, rows = token_ids[order], rows[order]
+        # Drop a row repeated under the same token (e.g. a token in two columns).
+        keep = np.ones(len(rows), dtype=bool)
+        keep[1:] = (token_ids[1:] != token_ids[:-1]) | (rows[1:] != rows[:-1])
+        token_ids, rows = token_ids[keep], rows[keep]
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(token_ids, minlength=len(vocab)), out=offsets[1:])
+        return cls(vocab, offsets, rows)
+
+    def extend(self, columns: Sequence[np.ndarray], start: int) -> "SearchIndex":
+        """Return a new index that also covers rows appended from ``start``.
+
+        Only the appended rows are tokenized; the existing postings are merged
+        as arrays.
+        """
+        added = SearchIndex.build(columns, start)
+        if not len(added.rows):
+            return self
+        vocab = np.union1d(self.vocab, added.vocab)
+        token_ids = np.concatenate(
+            [
+                np.repeat(np.searchsorted(vocab, index.vocab), np.diff(index.offsets))
+                for index in (self, added)
+            ]
+        )
+        return SearchIndex._from_ids(
+            vocab, token_ids, np.concatenate([self.rows, added.rows])
+        )
+
+    def prefix_rows(self, prefix: str) -> np.ndarray:
+        """Return the sorted, unique rows having a token that starts with ``prefix``."""
+        lo = np.searchsorted(self.vocab, prefix, side="left")
+        hi = np.searchsorted(self.vocab, prefix + "\U0010ffff", side="left")
+        if hi - lo == 1:
+            return self.rows[self.offsets[lo] : self.offsets[hi]]
+        return np.unique(self.rows[self.offsets[lo] : self.offsets[hi]])
+
+    def search(
+        self,
+        query: str,
+        token_rows: Optional[Callable[[str], np.ndarray]] = None,
+    ) -> np.ndarray:
+        """Return the rows in which every query token starts some row token.
+
+        ``token_rows`` replaces ``prefix_rows`` to find the sorted rows of
+        one token, e.g. to also match columns kept out of the index.
+        """
+        token_rows = token_rows or self.prefix_rows
+        postings = sorted((token_rows(token) for token in tokenize(query)), key=len)
+        if not postings:
+            return np.array([], dtype=np.int64)
+        result = postings[0]
+        for rows in postings[1:]:
+            if not len(result):
+                break
+            # Both postings are sorted: look up the shorter one in the longer.
+            positions = np.minimum(np.searchsorted(rows, result), len(rows) - 1)
+            result = result[rows[positions] == result] if len(rows) else rows
+        return result
@@ -0,0 +1,30 @@
+"""Read-only HTTP endpoint reporting the server's cache and session counters.
+
+``GET /api/stats`` returns one JSON object with a section per counter
+group: the shared dataset cache, the checklist partitions, the memory of
+the table sessions, their page caches, searches and dataset changes.
+"""
+
+from fastapi import FastAPI
+
+from .dataset_cache import cache_stats
+from .partitions import partition_stats
+from .table_state import change_stats, memory_stats, page_cache_stats, search_stats
+
+PATH = "/api/stats"
+
+
+async def stats() -> dict:
+    return {
+        "cache": cache_stats(),
+        "partitions": partition_stats(),
+        "memory": memory_stats(),
+        "pages": page_cache_stats(),
+        "search": search_stats(),
+        "changes": change_stats(),
+    }
+
+
+def register(api: FastAPI):
+    """Add the stats endpoint to the app's API."""
+    api.add_api_route(PATH, stats, methods=["GET"])
@@ -1,76 +1,385 @@
 import reflex as rx
-from typing import List, Dict
-import csv
-import pandas as pd
+from typing import Dict, List, Optional
+import asyncio
+import threading
+import time
+import numpy as np
+from reflex.utils import prerequisites
 
+from .change_feed import DatasetChange
+from .checklist_catalog import open_checklist, set_item_status
+from .dataset_cache import cache_stats, dataset_changes, dataset_version
+from .evidence import evidence_store
+from .exports import (
+    EXPORT_FORMATS,
+    ExportProgress,
+    format_size,
+    new_export_file,
+    submit,
+)
+from .item_store import EXPORT_HEADERS, Item, ItemStore
+from .partitions import on_evict
+from .progress import checklist_id
+from .repository import (
+    ItemRepository,
+    ItemView,
+    StoreRepository,
+    StoreView,
+    get_repository,
+)
+from .validation import VALID_STATUSES
 
-class Item(rx.Base):
-    """The item class representing a checklist task."""
 
-    name: str
-    payment: float
-    date: str
-    status: str
+ITEMS_PATH = "items.csv"
+
+# Seconds between checks for a new version of the dataset.
+DATASET_POLL_INTERVAL = 1.0
+
+
+def client_connected(token: str) -> bool:
+    """Return whether the client with ``token`` still has an open websocket."""
+    namespace = prerequisites.get_app().app.event_namespace
+    return namespace is None or token in namespace.token_to_sid
+
+
+# Rows per page the user can choose from.
+PAGE_SIZES = [12, 50, 200, 1000]
+# Pages kept per session; the neighbours of the current page are prefetched.
+PAGE_CACHE_SIZE = 5
+
+# Infinite-scroll mode: rows are fetched in windows of ``VIRTUAL_WINDOW_ROWS``
+# and two adjacent windows are rendered, padded to the height of the rest.
+VIRTUAL_ROW_HEIGHT = 40  # Pixels
+VIRTUAL_WINDOW_ROWS = 50
+VIRTUAL_VIEWPORT_ROWS = 15
+# Windows further than this from the visible one are evicted.
+VIRTUAL_KEEP_WINDOWS = 2
+
+# Process-wide counters of the debounced search, see ``search_stats``.
+_search_stats = {"queries": 0, "applied": 0, "skipped": 0, "cancelled": 0}
+_search_stats_lock = threading.Lock()
+
+
+def _count_search(outcome: str):
+    with _search_stats_lock:
+        _search_stats[outcome] += 1
+
+
+def search_stats() -> Dict[str, int]:
+    """Return how many search queries were received, applied, skipped or cancelled.
+
+    A query is skipped when a newer keystroke arrives within the debounce
+    window, and cancelled when one arrives while its filter is running.
+    """
+    with _search_stats_lock:
+        return dict(_search_stats)
+
+
+# Process-wide counters of dataset changes delivered to table sessions.
+_change_stats = {"changes": 0, "rows": 0, "pushed": 0, "skipped": 0}
+_change_stats_lock = threading.Lock()
+
+
+def change_stats() -> Dict[str, int]:
+    """Return how many dataset changes reached sessions and how many touched a page.
+
+    ``rows`` counts the inserted, updated and deleted rows seen by sessions;
+    a change is ``pushed`` when it altered the visible page of a session and
+    ``skipped`` when no page data had to be sent.
+    """
+    with _change_stats_lock:
+        return dict(_change_stats)
+
+
+# Process-wide counters of the per-session page caches.
+_page_stats = {"hits": 0, "misses": 0, "prefetched": 0}
+_page_stats_lock = threading.Lock()
+
+
+def _count_page(outcome: str, count: int = 1):
+    with _page_stats_lock:
+        _page_stats[outcome] += count
+
+
+def page_cache_stats() -> Dict[str, float]:
+    """Return the page cache hits, misses and prefetched pages, and the hit rate.
+
+    A hit is a page turn served from the session's cache without touching
+    the view.
+    """
+    with _page_stats_lock:
+        stats: Dict[str, float] = dict(_page_stats)
+    turns = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / turns if turns else 0.0
+    return stats
+
+
+class _Session:
+    """The backend objects of one table session.
+
+    They are kept here, by client token, rather than in backend vars: Reflex
+    pickles the state of a session on every event, which would copy the
+    shared store into each session's saved state.
+    """
+
+    def __init__(
+        self, repository: ItemRepository, view: ItemView, checklist_id: str = ""
+    ):
+        self.repository = repository
+        self.view = view
+        # The checklist whose partition ``repository`` holds, if any.
+        self.checklist_id = checklist_id
+        # LRU of the pages of the current view and limit, by offset.
+        self.pages: Dict[int, List[Item]] = {}
+        # Row windows by index, kept around the visible one.
+        self.windows: Dict[int, List[Item]] = {}
+
+
+_sessions: Dict[str, _Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _drop_sessions(checklist: str):
+    """Forget the sessions holding the evicted partition of ``checklist``.
+
+    Otherwise they would keep its store alive; they reopen the checklist on
+    their next event.
+    """
+    with _sessions_lock:
+        for token in [
+            token
+            for token, session in _sessions.items()
+            if session.checklist_id == checklist
+        ]:
+            del _sessions[token]
+
+
+on_evict(_drop_sessions)
+
+
+def _open_repository(checklist: str) -> ItemRepository:
+    """Return the repository of ``checklist``, or of the shared items file."""
+    try:
+        if checklist:
+            return StoreRepository(open_checklist(checklist))
+        return get_repository(ITEMS_PATH)
+    except FileNotFoundError as e:
+        print(f"The file '{e.filename}' was not found.")
+    except KeyError as e:
+        print(f"Missing column in CSV: {e}")
+    except ValueError as e:
+        # Empty or malformed files, e.g. pandas' EmptyDataError.
+        print(f"Could not parse the items: {e}")
+    return StoreRepository(ItemStore.empty())
+
+
+def memory_stats() -> Dict[str, int]:
+    """Return the memory of the shared snapshot and the private memory per session.
+
+    Sessions share the parsed dataset; a session only owns the row indices
+    of a searched view.
+    """
+    shared = cache_stats()["bytes"]
+    with _sessions_lock:
+        sessions = len(_sessions)
+        private = sum(session.view.private_bytes() for session in _sessions.values())
+    return {
+        "shared_bytes": shared,
+        "sessions": sessions,
+        "private_bytes": private,
+        "bytes_per_session": private // sessions if sessions else 0,
+    }
+
+
+def _updated_view(
+    repository: ItemRepository,
+    view: ItemView,
+    changes: Optional[List[DatasetChange]],
+    search_value: str,
+    sort_value: str,
+    sort_reverse: bool,
+) -> ItemView:
+    """Return ``view`` moved onto ``repository``, filtering again only if needed.
+
+    When rows were only appended and none of them match the search, the
+    rows of the view and their order are unchanged.
+    """
+    if (
+        changes is not None
+        and all(change.appended_only for change in changes)
+        and isinstance(repository, StoreRepository)
+        and isinstance(view, StoreView)
+    ):
+        inserted = np.concatenate(
+            [change.inserted for change in changes] + [np.arange(0)]
+        )
+        matches = repository.store.search(search_value)
+        if not np.isin(inserted, matches, assume_unique=True).any():
+            return StoreView(repository.store, view.indices)
+    return repository.view(search_value, sort_value, sort_reverse)
 
 
 class TableState(rx.State):
     """State to manage the checklist table."""
 
-    items: List[Item] = []
+    # Checklist whose partition is shown; empty for the shared items file.
+    checklist_id: str = ""
+
     search_value: str = ""
     sort_value: str = ""
     sort_reverse: bool = False
 
     total_items: int = 0
+    filtered_items: int = 0
     offset: int = 0
-    limit: int = 12  # Number of rows per page
+    limit: int = 12  # Number of rows per page, one of PAGE_SIZES
 
-    def validate_item(self, item: Item) -> bool:
-        """Validate an item before adding it to the list."""
-        try:
-            assert item.payment >= 0, "Payment must be positive."
-            assert item.status in ["Pending", "Completed", "In Progress"], "Invalid status."
-            return True
-        except AssertionError as e:
-            print(f"Validation error: {e}")
-            return False
+    # Task the next evidence upload is attached to.
+    evidence_task: str = ""
+    evidence_message: str = ""
+    # Bumped after every upload so the per-row evidence counts refresh.
+    _evidence_version: int = 0
+
+    exporting: bool = False
+    export_progress: int = 0  # Percentage of rows written
+    last_export: str = ""
+
+    # The repository, view and page caches of the session are in
+    # ``_sessions``; only plain values are kept in the state.
+
+    # Bumped whenever the rows of the current page may have changed.
+    _page_version: int = 0
+
+    # Infinite-scroll mode and the index of the first rendered row window.
+    virtual_mode: bool = False
+    window_index: int = 0
+    # Bumped whenever the rendered windows change.
+    _window_version: int = 0
+
+    # Version of the shared dataset shown, and whether it is being watched.
+    _dataset_version: int = 0
+    _watching: bool = False
+
+    # Seconds to wait for further keystrokes before running a search.
+    _search_debounce: float = 0.3
+    # Incremented on every keystroke; a search only applies if still current.
+    _search_generation: int = 0
 
     def load_entries(self):
-        """Load items from a CSV file."""
+        """Load items from the configured repository and watch for changes.
+
+        With a ``checklist`` query parameter only the items of that
+        checklist are loaded, from its shared partition.
+        """
+        self.checklist_id = checklist_id(self.router.page.params.get("checklist", ""))
+        repository = _open_repository(self.checklist_id)
+        self._dataset_version = dataset_version(ITEMS_PATH)
+        self.total_items = len(repository)
+        self._apply_view(
+            repository.view(self.search_value, self.sort_value, self.sort_reverse),
+            repository,
+        )
+        if not self._watching:
+            return [TableState.watch_dataset, TableState.prefetch_pages]
+        return TableState.prefetch_pages
+
+    @rx.event(background=True)
+    async def watch_dataset(self):
+        """Refresh the table whenever a new version of the dataset is loaded.
+
+        The rows inserted, updated or deleted since the shown version decide
+        whether the view has to be filtered again, and the page is only sent
+        to the client when its rows changed. Runs for as long as the client
+        stays connected.
+        """
+        async with self:
+            if self._watching:
+                return
+            self._watching = True
+            token = self.router.session.client_token
+            seen = self._dataset_version
         try:
-            with open("items.csv", mode="r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-                self.items = [
-                    Item(
-                        name=row["name"],
-                        payment=float(row["payment"]),
-                        date=row["date"],
-                        status=row["status"],
-                    )
-                    for row in reader
-                    if self.validate_item(
-                        Item(
-                            name=row["name"],
-                            payment=float(row["payment"]),
-                            date=row["date"],
-                            status=row["status"],
+            while client_connected(token):
+                await asyncio.sleep(DATASET_POLL_INTERVAL)
+                # The state lock is only taken once the version moved.
+                version = dataset_version(ITEMS_PATH)
+                if version == seen:
+                    continue
+                seen = version
+                async with self:
+                    # Partitions are not watched; they reload when reopened.
+                    if self.checklist_id or version == self._dataset_version:
+                        continue
+                    since = self._dataset_version
+                    params = (self.search_value, self.sort_value, self.sort_reverse)
+                    view = self._session().view
+                changes = dataset_changes(ITEMS_PATH, since)
+                try:
+                    repository = await asyncio.to_thread(get_repository, ITEMS_PATH)
+                except (FileNotFoundError, KeyError, ValueError):
+                    continue
+                view = await asyncio.to_thread(
+                    _updated_view, repository, view, changes, *params
+                )
+                async with self:
+                    if params != (self.search_value, self.sort_value, self.sort_reverse):
+                        view = repository.view(
+                            self.search_value, self.sort_value, self.sort_reverse
                         )
+                    self._dataset_version = version
+                    if self.total_items != len(repository):
+                        self.total_items = len(repository)
+                    self._apply_changed_view(view, repository)
+                with _change_stats_lock:
+                    _change_stats["changes"] += 1
+                    _change_stats["rows"] += sum(
+                        change.row_count for change in changes or []
                     )
-                ]
-                self.total_items = len(self.items)
-        except FileNotFoundError:
-            print("The file 'items.csv' was not found.")
-            self.items = []
-            self.total_items = 0
-        except KeyError as e:
-            print(f"Missing column in CSV: {e}")
-            self.items = []
-            self.total_items = 0
-
-    def upload_evidence(self, task_name: str, file):
-        """Handle evidence upload for a specific task."""
-        print(f"Uploaded evidence for task: {task_name}, file: {file.name}")
-        # Logic for saving the file can be added here, e.g., saving it to a specific folder.
+        finally:
+            async with self:
+                self._watching = False
+            with _sessions_lock:
+                _sessions.pop(token, None)
+
+    async def upload_evidence(self, files: List[rx.UploadFile]):
+        """Store evidence files for the task set just before by the drop event chain.
+
+        Files of one batch are written concurrently, within the per-session
+        and per-server write caps.
+        """
+        if not self.evidence_task:
+            self.evidence_message = "Choose the task to attach the evidence to."
+            return
+        records = await evidence_store().save_many(
+            self.router.session.client_token,
+            self.evidence_task,
+            files,
+            checklist_id=self.checklist_id,
+        )
+        self._evidence_version += 1
+        new = sum(record.stored for record in records)
+        self.evidence_message = (
+            f"Saved {len(records)} file(s) for {self.evidence_task}"
+            f" ({len(records) - new} already stored)"
+        )
+
+    def set_item_status(self, row: int, status: str):
+        """Change the status of item ``row`` of the open checklist.
+
+        ``row`` is the item's position in the checklist's store, as sent
+        with the page, so items sharing a name are told apart.
+        """
+        repository = self._session().repository
+        if (
+            not self.checklist_id
+            or status not in VALID_STATUSES
+            or not isinstance(repository, StoreRepository)
+            or not 0 <= row < len(repository)
+        ):
+            return
+        set_item_status(self.checklist_id, row, status)
+        self._refresh_view()
+        return TableState.prefetch_pages
 
     def toggle_sort(self, column: str):
         """Toggle the sort order for a specific column."""
@@ -79,56 +388,308 @@ class TableState(rx.State):
         else:
             self.sort_value = column
             self.sort_reverse = False
+        self._refresh_view()
+        return TableState.prefetch_pages
 
-    def export_to_excel(self):
-        """Export the current checklist to an Excel file."""
-        df = pd.DataFrame(
-            [
-                {
-                    "Task Name": item.name,
-                    "Payment": item.payment,
-                    "Date": item.date,
-                    "Status": item.status,
-                }
-                for item in self.filtered_sorted_items
+    @rx.event(background=True)
+    async def set_search_value(self, value: str):
+        """Update the search value and, once typing pauses, filter the table.
+
+        Keystrokes within the debounce window are coalesced, and a filter
+        superseded by a newer query while running is discarded, so only the
+        page of the final query is pushed to the client.
+        """
+        _count_search("queries")
+        async with self:
+            self.search_value = value
+            self._search_generation += 1
+            generation = self._search_generation
+            debounce = self._search_debounce
+        await asyncio.sleep(debounce)
+        async with self:
+            if generation != self._search_generation:
+                _count_search("skipped")
+                return
+            repository, sort_value, sort_reverse = (
+                self._session().repository,
+                self.sort_value,
+                self.sort_reverse,
+            )
+        view = await asyncio.to_thread(
+            repository.view, value, sort_value, sort_reverse
+        )
+        async with self:
+            if (
+                generation != self._search_generation
+                or repository is not self._session().repository
+                or (sort_value, sort_reverse) != (self.sort_value, self.sort_reverse)
+            ):
+                _count_search("cancelled")
+                return
+            self.offset = 0
+            self._apply_view(view)
+        _count_search("applied")
+        return TableState.prefetch_pages
+
+    def set_page_size(self, size: str):
+        """Show ``size`` rows per page, staying on the page of the first row."""
+        if int(size) not in PAGE_SIZES:
+            return
+        self.limit = int(size)
+        self.offset = self.offset // self.limit * self.limit
+        self._session().pages = {}
+        self._page_version += 1
+        return TableState.prefetch_pages
+
+    @rx.event(background=True)
+    async def prefetch_pages(self):
+        """Fill the page cache with the pages around the current one.
+
+        Pages are read from the view off the event loop; they are dropped if
+        the view or the page size changed in the meantime.
+        """
+        async with self:
+            session = self._session()
+            view, offset, limit = session.view, self.offset, self.limit
+            wanted = [
+                start
+                for start in (offset + limit, offset - limit)
+                if 0 <= start < self.filtered_items and start not in session.pages
             ]
+        if not wanted:
+            return
+        pages = await asyncio.to_thread(
+            lambda: [(start, view.page(start, limit)) for start in wanted]
         )
-        file_name = "checklist_export.xlsx"
-        df.to_excel(file_name, index=False)
-        print(f"Checklist exported to {file_name}")
-        rx.download(file_name)
+        async with self:
+            if view is not self._session().view or limit != self.limit:
+                return
+            for start, items in pages:
+                self._cache_page(start, items)
+        _count_page("prefetched", len(pages))
 
-    @rx.var(cache=True)
-    def filtered_sorted_items(self) -> List[Item]:
-        """Get filtered and sorted items."""
-        items = self.items
-
-        if self.sort_value:
-            if self.sort_value in ["payment"]:
-                items = sorted(
-                    items,
-                    key=lambda item: float(getattr(item, self.sort_value)),
-                    reverse=self.sort_reverse,
-                )
-            else:
-                items = sorted(
-                    items,
-                    key=lambda item: str(getattr(item, self.sort_value)).lower(),
-                    reverse=self.sort_reverse,
+    def set_virtual_mode(self, enabled: bool):
+        """Switch between paged and infinite-scroll display."""
+        self.virtual_mode = enabled
+        self.window_index = 0
+        self._session().windows = {}
+        if enabled:
+            self._load_windows()
+            return TableState.prefetch_window(2)
+
+    def scroll_rows(self, top: float):
+        """Render the row windows under the scroll position ``top`` (pixels).
+
+        Only a change of window updates the state; the window after the
+        rendered ones (or before, when scrolling up) is then prefetched.
+        """
+        index = int(top // VIRTUAL_ROW_HEIGHT) // VIRTUAL_WINDOW_ROWS
+        index = min(max(index, 0), self._last_window())
+        if index == self.window_index:
+            return
+        forward = index > self.window_index
+        self.window_index = index
+        self._load_windows()
+        return TableState.prefetch_window(index + 2 if forward else index - 1)
+
+    @rx.event(background=True)
+    async def prefetch_window(self, index: int):
+        """Fetch the row window ``index`` off the event loop, ahead of scrolling."""
+        async with self:
+            session = self._session()
+            if index < 0 or index > self._last_window() or index in session.windows:
+                return
+            view = session.view
+        items = await asyncio.to_thread(
+            view.page, index * VIRTUAL_WINDOW_ROWS, VIRTUAL_WINDOW_ROWS
+        )
+        async with self:
+            session = self._session()
+            if (
+                view is session.view
+                and abs(index - self.window_index) <= VIRTUAL_KEEP_WINDOWS
+            ):
+                session.windows[index] = items
+
+    def export_to_excel(self):
+        """Export the current view to an Excel file."""
+        return TableState.export_view("xlsx")
+
+    @rx.event(background=True)
+    async def export_view(self, export_format: str):
+        """Export the current view without blocking other events.
+
+        Rows are streamed in chunks to a unique file on the export thread
+        pool while the progress is reported to the UI. The size and duration
+        of the export are reported once it finishes.
+        """
+        if export_format not in EXPORT_FORMATS:
+            return
+        suffix, writer = EXPORT_FORMATS[export_format]
+        async with self:
+            if self.exporting:
+                return
+            self.exporting = True
+            self.export_progress = 0
+            view = self._session().view
+        started = time.perf_counter()
+        try:
+            path, url = new_export_file(suffix)
+            progress = ExportProgress(len(view))
+            future = asyncio.wrap_future(
+                submit(
+                    writer,
+                    view.iter_frames(),
+                    list(EXPORT_HEADERS.values()),
+                    path,
+                    progress,
                 )
+            )
+            while not future.done():
+                await asyncio.wait({future}, timeout=0.5)
+                async with self:
+                    self.export_progress = progress.percent
+            await future
+        finally:
+            async with self:
+                self.exporting = False
+        elapsed = time.perf_counter() - started
+        size = path.stat().st_size
+        async with self:
+            self.last_export = (
+                f"{len(view):,} rows as {export_format}: "
+                f"{format_size(size)} in {elapsed:.1f}s"
+            )
+        print(f"Checklist exported to {path} ({size} bytes, {elapsed:.2f}s)")
+        return rx.download(url=url, filename=f"checklist_export{suffix}")
+
+    def _session(self) -> _Session:
+        """Return the backend objects of this session.
+
+        After a server restart the saved state outlives them, so they are
+        rebuilt from the checklist, search and sort kept in the state.
+        """
+        token = self.router.session.client_token
+        with _sessions_lock:
+            session = _sessions.get(token)
+        if session is None:
+            repository = _open_repository(self.checklist_id)
+            session = _Session(
+                repository,
+                repository.view(self.search_value, self.sort_value, self.sort_reverse),
+                self.checklist_id,
+            )
+            with _sessions_lock:
+                session = _sessions.setdefault(token, session)
+        return session
+
+    def _refresh_view(self):
+        """Recompute the filtered and sorted row indices on the backend."""
+        self._apply_view(
+            self._session().repository.view(
+                self.search_value, self.sort_value, self.sort_reverse
+            )
+        )
+
+    def _apply_view(
+        self, view: ItemView, repository: Optional[ItemRepository] = None
+    ):
+        """Show ``view`` in the table, keeping the offset on a valid page."""
+        self._replace_session(view, repository)
+        self.filtered_items = len(view)
+        last_offset = max(self.filtered_items - 1, 0) // self.limit * self.limit
+        self.offset = min(self.offset, last_offset)
+        self._page_version += 1
+        self._reset_windows()
+
+    def _apply_changed_view(self, view: ItemView, repository: ItemRepository):
+        """Show ``view`` after a dataset change, sending only what changed."""
+        shown = self._session().view.page(self.offset, self.limit)
+        self._replace_session(view, repository)
+        if self.filtered_items != len(view):
+            self.filtered_items = len(view)
+        last_offset = max(self.filtered_items - 1, 0) // self.limit * self.limit
+        if self.offset > last_offset:
+            self.offset = last_offset
+        self._reset_windows()
+        changed = view.page(self.offset, self.limit) != shown
+        if changed:
+            self._page_version += 1
+        with _change_stats_lock:
+            _change_stats["pushed" if changed else "skipped"] += 1
+
+    def _replace_session(
+        self, view: ItemView, repository: Optional[ItemRepository] = None
+    ):
+        """Show ``view`` (of ``repository``), dropping the cached pages and windows."""
+        token = self.router.session.client_token
+        if repository is None:
+            repository = self._session().repository
+        with _sessions_lock:
+            previous = _sessions.get(token)
+            _sessions[token] = _Session(repository, view, self.checklist_id)
+            # Kept for ``_reset_windows`` to tell whether the rendered rows changed.
+            if previous is not None:
+                _sessions[token].windows = previous.windows
+
+    def _cache_page(self, offset: int, items: List[Item]):
+        """Store a page as the most recently used, evicting the least recent."""
+        pages = self._session().pages
+        pages.pop(offset, None)
+        pages[offset] = items
+        while len(pages) > PAGE_CACHE_SIZE:
+            del pages[next(iter(pages))]
+
+    def _turn_page(self, offset: int):
+        """Move to the page at ``offset``, from the cache when it was prefetched."""
+        items = self._session().pages.get(offset)
+        if items is None:
+            _count_page("misses")
+            items = self._session().view.page(offset, self.limit)
+        else:
+            _count_page("hits")
+        self._cache_page(offset, items)
+        self.offset = offset
+        return TableState.prefetch_pages
 
-        if self.search_value:
-            search_value = self.search_value.lower()
-            items = [
-                item
-                for item in items
-                if any(
-                    search_value in str(getattr(item, attr)).lower()
-                    for attr in ["name", "payment", "date", "status"]
+    def _last_window(self) -> int:
+        return max(self.filtered_items - 1, 0) // VIRTUAL_WINDOW_ROWS
+
+    def _shown_rows(self) -> List[Item]:
+        windows = self._session().windows
+        return windows.get(self.window_index, []) + windows.get(
+            self.window_index + 1, []
+        )
+
+    def _load_windows(self, shown: Optional[List[Item]] = None):
+        """Fill the two rendered windows from the cache or the view, evict far ones.
+
+        The rendered rows are only sent again if they differ from ``shown``,
+        by default the rows rendered before.
+        """
+        if shown is None:
+            shown = self._shown_rows()
+        session = self._session()
+        for index in (self.window_index, self.window_index + 1):
+            if index not in session.windows:
+                session.windows[index] = session.view.page(
+                    index * VIRTUAL_WINDOW_ROWS, VIRTUAL_WINDOW_ROWS
                 )
-            ]
+        for index in list(session.windows):
+            if abs(index - self.window_index) > VIRTUAL_KEEP_WINDOWS:
+                del session.windows[index]
+        if self._shown_rows() != shown:
+            self._window_version += 1
 
-        return items
+    def _reset_windows(self):
+        """Drop the row windows of the previous view."""
+        if self.window_index > self._last_window():
+            self.window_index = self._last_window()
+        if not self.virtual_mode:
+            return
+        shown = self._shown_rows()
+        self._session().windows = {}
+        self._load_windows(shown)
 
     @rx.var(cache=True)
     def page_number(self) -> int:
@@ -137,32 +698,69 @@ class TableState(rx.State):
 
     @rx.var(cache=True)
     def total_pages(self) -> int:
-        """Get the total number of pages."""
-        return (self.total_items // self.limit) + (
-            1 if self.total_items % self.limit else 0
+        """Get the total number of pages of the filtered view."""
+        return max(
+            (self.filtered_items // self.limit)
+            + (1 if self.filtered_items % self.limit else 0),
+            1,
         )
 
-    @rx.var(cache=True, initial_value=[])
+    @rx.var(
+        cache=True,
+        initial_value=[],
+        deps=["_page_version", "offset", "limit"],
+        auto_deps=False,
+    )
     def get_current_page(self) -> List[Item]:
         """Get the items for the current page."""
-        start_index = self.offset
-        end_index = start_index + self.limit
-        return self.filtered_sorted_items[start_index:end_index]
+        session = self._session()
+        items = session.pages.get(self.offset)
+        return items if items is not None else session.view.page(self.offset, self.limit)
+
+    @rx.var(
+        cache=True,
+        initial_value=[],
+        deps=["_window_version", "window_index"],
+        auto_deps=False,
+    )
+    def window_rows(self) -> List[Item]:
+        """Get the items of the rendered windows in infinite-scroll mode."""
+        return self._shown_rows()
+
+    @rx.var(cache=True)
+    def window_padding_top(self) -> str:
+        """Get the height of the rows above the rendered windows."""
+        return f"{self.window_index * VIRTUAL_WINDOW_ROWS * VIRTUAL_ROW_HEIGHT}px"
+
+    @rx.var(cache=True)
+    def window_padding_bottom(self) -> str:
+        """Get the height of the rows below the rendered windows."""
+        below = self.filtered_items - (self.window_index + 2) * VIRTUAL_WINDOW_ROWS
+        return f"{max(below, 0) * VIRTUAL_ROW_HEIGHT}px"
+
+    @rx.var(cache=True, initial_value={})
+    def evidence_counts(self) -> Dict[str, int]:
+        """Get the number of evidence files of each task on screen."""
+        self._evidence_version  # Recompute after uploads.
+        rows = self.window_rows if self.virtual_mode else self.get_current_page
+        return evidence_store().catalog.counts(
+            self.checklist_id, (item.name for item in rows)
+        )
 
     def prev_page(self):
         """Navigate to the previous page."""
         if self.page_number > 1:
-            self.offset -= self.limit
+            return self._turn_page(self.offset - self.limit)
 
     def next_page(self):
         """Navigate to the next page."""
         if self.page_number < self.total_pages:
-            self.offset += self.limit
+            return self._turn_page(self.offset + self.limit)
 
     def first_page(self):
         """Navigate to the first page."""
-        self.offset = 0
+        return self._turn_page(0)
 
     def last_page(self):
         """Navigate to the last page."""
-        self.offset = (self.total_pages - 1) * self.limit
+        return self._turn_page((self.total_pages - 1) * self.limit)
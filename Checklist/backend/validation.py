@@ -0,0 +1,96 @@
+"""Column-wise validation of loaded item rows."""
+
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .item_store import parse_dates
+
+
+VALID_STATUSES = ["Pending", "Completed", "In Progress"]
+
+# Rejection reasons, in the order they are reported for a row.
+INVALID_PAYMENT = "Payment must be a positive number."
+INVALID_STATUS = "Invalid status."
+INVALID_DATE = "Invalid date."
+
+
+class ValidationReport:
+    """Outcome of validating a frame of item rows.
+
+    ``accepted`` is a boolean mask over the input rows and ``reasons`` maps
+    each rejection reason to the (0-based) indices of the rows it rejected.
+    """
+
+    def __init__(self, total: int, reasons: Dict[str, np.ndarray]):
+        self.total = total
+        self.reasons = reasons
+        rejected = np.zeros(total, dtype=bool)
+        for rows in reasons.values():
+            rejected[rows] = True
+        self.accepted = ~rejected
+
+    @property
+    def accepted_count(self) -> int:
+        return int(self.accepted.sum())
+
+    @property
+    def rejected_count(self) -> int:
+        return self.total - self.accepted_count
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of rows rejected for each reason."""
+        return {reason: len(rows) for reason, rows in self.reasons.items() if len(rows)}
+
+    def rejected_rows(self) -> Iterator[Tuple[int, List[str]]]:
+        """Yield ``(row, reasons)`` for every rejected row, in row order."""
+        by_row: Dict[int, List[str]] = {}
+        for reason, rows in self.reasons.items():
+            for row in rows.tolist():
+                by_row.setdefault(row, []).append(reason)
+        for row in sorted(by_row):
+            yield row, by_row[row]
+
+    def extend(self, other: "ValidationReport") -> "ValidationReport":
+        """Return the report of these rows followed by the rows of ``other``."""
+        reasons = {
+            reason: np.concatenate(
+                [
+                    self.reasons.get(reason, np.array([], dtype=np.int64)),
+                    other.reasons.get(reason, np.array([], dtype=np.int64)) + self.total,
+                ]
+            )
+            for reason in {**self.reasons, **other.reasons}
+        }
+        return ValidationReport(self.total + other.total, reasons)
+
+    def summary(self) -> str:
+        """Return a one-line description of the report."""
+        if not self.rejected_count:
+            return f"All {self.total} rows are valid."
+        details = ", ".join(f"{reason} ({count})" for reason, count in self.counts().items())
+        return f"Rejected {self.rejected_count} of {self.total} rows: {details}"
+
+
+def validate_columns(
+    df: pd.DataFrame, allowed_statuses: Sequence[str] = VALID_STATUSES
+) -> Tuple[ValidationReport, np.ndarray, np.ndarray]:
+    """Validate whole columns of ``df`` in one pass.
+
+    Returns the report together with the numeric payment column and the
+    parsed date column, so callers do not have to convert them again.
+
+    Raises:
+        KeyError: If a required column is missing.
+    """
+    payment = pd.to_numeric(df["payment"], errors="coerce").to_numpy(dtype=np.float64)
+    date_value = parse_dates(df["date"].to_numpy(dtype=object))
+    status = df["status"].to_numpy(dtype=object)
+    reasons = {
+        # NaN compares false, so non-numeric payments are rejected here as well.
+        INVALID_PAYMENT: np.flatnonzero(~(payment >= 0)),
+        INVALID_STATUS: np.flatnonzero(~np.isin(status, list(allowed_statuses))),
+        INVALID_DATE: np.flatnonzero(np.isnat(date_value)),
+    }
+    return ValidationReport(len(df), reasons), payment, date_value
@@ -0,0 +1,29 @@
+import dataclasses
+from typing import Tuple
+
+import reflex as rx
+from reflex.vars.base import Var
+
+
+@dataclasses.dataclass(frozen=True)
+class _ScrollTarget:
+    scrollTop: float = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class _ScrollEvent:
+    target: _ScrollTarget = _ScrollTarget()
+
+
+def _scroll_top(e: Var[_ScrollEvent]) -> Tuple[Var[float]]:
+    """Get the vertical scroll position from a scroll event."""
+    return (e.target.scrollTop,)
+
+
+class ScrollBox(rx.el.Div):
+    """A div whose ``on_scroll`` passes its scroll position in pixels."""
+
+    on_scroll: rx.EventHandler[_scroll_top]
+
+
+scroll_box = ScrollBox.create
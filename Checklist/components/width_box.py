@@ -0,0 +1,66 @@
+import dataclasses
+from typing import Tuple
+
+import reflex as rx
+from reflex.vars.base import Var
+
+
+# Resizes are reported once the width has been stable for this many ms.
+RESIZE_DEBOUNCE_MS = 200
+
+
+@dataclasses.dataclass(frozen=True)
+class _Element:
+    clientWidth: int = 0
+
+
+def _client_width(el: Var[_Element]) -> Tuple[Var[int]]:
+    """Get the width of the resized element in pixels."""
+    return (el.clientWidth,)
+
+
+class WidthBox(rx.el.Div):
+    """A div whose ``on_resize`` passes its new ``clientWidth`` in pixels.
+
+    The width is observed with a ``ResizeObserver``; changes are debounced
+    and only reported when the width differs from the last one, so the
+    width at mount is left to ``on_mount``.
+    """
+
+    on_resize: rx.EventHandler[_client_width]
+
+    def add_hooks(self):
+        ref = self.get_ref()
+        on_resize = self.event_triggers.get("on_resize")
+        if ref is None or on_resize is None:
+            return []
+        return [
+            f"""useEffect(() => {{
+    const el = {ref}.current;
+    if (!el || typeof ResizeObserver === "undefined") return;
+    const onResize = {Var.create(on_resize)!s};
+    let width = el.clientWidth;
+    let timer;
+    const observer = new ResizeObserver(() => {{
+        clearTimeout(timer);
+        timer = setTimeout(() => {{
+            if (el.clientWidth !== width) {{
+                width = el.clientWidth;
+                onResize(el);
+            }}
+        }}, {RESIZE_DEBOUNCE_MS});
+    }});
+    observer.observe(el);
+    return () => {{
+        clearTimeout(timer);
+        observer.disconnect();
+    }};
+}}, []);"""
+        ]
+
+    def _exclude_props(self) -> list[str]:
+        # Divs have no resize event; the hook above reports it instead.
+        return ["on_resize"]
+
+
+width_box = WidthBox.create
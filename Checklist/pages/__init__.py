@@ -1,4 +1,5 @@
 from .index import index
 from .table import table
 from .settings import settings
-from .about import about
\ No newline at end of file
+from .about import about
+from .create_checklist import create_checklist
\ No newline at end of file
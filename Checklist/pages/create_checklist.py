@@ -3,7 +3,7 @@
 import reflex as rx
 from ..templates import template
 from .. import styles
-from .checklist_state import ChecklistState
+from ..views.checklist_state import ChecklistState
 
 
 @template(route="/create-checklist", title="Create/Edit Checklist")
@@ -29,7 +29,7 @@ def create_checklist() -> rx.Component:
             placeholder="Checklist Items (one per line)",
             value=ChecklistState.new_checklist_items,
             on_change=ChecklistState.set_new_checklist_items,
-            rows=10,
+            rows="10",
             width="100%",
         ),
         rx.select(
@@ -38,6 +38,10 @@ def create_checklist() -> rx.Component:
             on_change=ChecklistState.set_new_owner,
             width="100%",
         ),
+        rx.cond(
+            ChecklistState.create_error,
+            rx.text(ChecklistState.create_error, color="red"),
+        ),
         rx.button(
             "Save Checklist",
             on_click=ChecklistState.save_checklist,
@@ -1,7 +1,9 @@
 import reflex as rx
 from ..templates import template
 from .. import styles
-from ..views.checklist_state import ChecklistState
+from ..views.charts import StatsState, charts_card
+from ..views.checklist_state import PROGRESS_THRESHOLDS, ChecklistState
+from ..views.stats_cards import KpiState, stats_cards
 
 
 def checklist_table(data: list) -> rx.Component:
@@ -26,10 +28,14 @@ def checklist_table(data: list) -> rx.Component:
             rx.foreach(
                 data,
                 lambda item: rx.table.row(
-                    rx.table.cell(item["Name"]),
+                    rx.table.cell(
+                        rx.link(item["Name"], href=f"/checklist?checklist={item['Id']}")
+                    ),
                     rx.table.cell(item["Owner"]),
                     rx.table.cell(item["Status"]),
-                    rx.table.cell(f"{item['Progress']}%"),
+                    rx.table.cell(
+                        f"{item['Done']}/{item['Total']} ({item['Progress']}%)"
+                    ),
                 )
             )
         ),
@@ -37,7 +43,15 @@ def checklist_table(data: list) -> rx.Component:
     )
 
 
-@template(route="/", title="Checklist Overview")
+@template(
+    route="/",
+    title="Checklist Overview",
+    on_load=[
+        KpiState.load_kpis,
+        StatsState.load_charts,
+        ChecklistState.load_checklists,
+    ],
+)
 def index() -> rx.Component:
     """The overview page for checklists.
 
@@ -46,6 +60,8 @@ def index() -> rx.Component:
     """
     return rx.vstack(
         rx.heading("Checklist Overview", size="5"),
+        stats_cards(),
+        charts_card(),
         rx.flex(
             rx.input(
                 placeholder="Search checklist...",
@@ -64,6 +80,17 @@ def index() -> rx.Component:
                 on_change=ChecklistState.set_status_filter,
                 width="200px",
             ),
+            rx.select(
+                PROGRESS_THRESHOLDS,
+                value=ChecklistState.min_progress.to_string(),
+                on_change=ChecklistState.set_min_progress,
+                width="120px",
+            ),
+            rx.button(
+                "Sort by progress",
+                on_click=ChecklistState.toggle_progress_sort,
+                variant=rx.cond(ChecklistState.sort_by_progress, "solid", "outline"),
+            ),
             rx.button(
                 "Create New Checklist",
                 on_click=ChecklistState.go_to_create_page,
@@ -79,6 +106,7 @@ def index() -> rx.Component:
         rx.button(
             "Download as Excel",
             on_click=ChecklistState.download_checklists,
+            disabled=ChecklistState.exporting,
             color="white",
             background_color="green",
             hover={"background_color": "darkgreen"},
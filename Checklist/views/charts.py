@@ -1,57 +1,106 @@
+import asyncio
+
 import reflex as rx
-import random
-import datetime
+from typing import Any, Dict, List
 from reflex.components.radix.themes.base import (
     LiteralAccentColor,
 )
 
+from ..backend.dataset_cache import dataset_version, start_watcher
+from ..backend.rollups import SERIES, chart_points
+from ..backend.table_state import DATASET_POLL_INTERVAL, ITEMS_PATH, client_connected
+from ..components.card import card
+from ..components.width_box import width_box
+
+# Timeframe option -> rollup period of the chart series.
+TIMEFRAMES = {"Daily": "day", "Weekly": "week", "Monthly": "month", "Yearly": "year"}
+
+# Series are downsampled to about one point per this many pixels of width.
+PIXELS_PER_POINT = 4
+MIN_POINTS = 50
+MAX_POINTS = 500
+# Point budget used until the charts container has been measured.
+DEFAULT_POINTS = 300
+
+# Id of the element the charts are drawn in; its width sets the point budget.
+CHARTS_CONTAINER_ID = "charts_container"
+
+
+def _series(timeframe: str, budget: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Return the points of every series, empty if the items file is unreadable."""
+    try:
+        points = chart_points(ITEMS_PATH, TIMEFRAMES[timeframe], budget)
+        start_watcher(ITEMS_PATH)
+    except (FileNotFoundError, KeyError, ValueError):
+        points = {name: [] for name in SERIES}
+    return points
+
 
 class StatsState(rx.State):
     area_toggle: bool = True
     selected_tab: str = "users"
     timeframe: str = "Monthly"
-    users_data = []
-    revenue_data = []
-    orders_data = []
-    device_data = []
-    yearly_device_data = []
+    # Items, payment sum and completed items per time bucket.
+    users_data: List[Dict[str, Any]] = []
+    revenue_data: List[Dict[str, Any]] = []
+    orders_data: List[Dict[str, Any]] = []
+    device_data: List[Dict[str, Any]] = []
+    yearly_device_data: List[Dict[str, Any]] = []
+    # Maximum points per series, derived from the chart width; 0 until measured.
+    _point_budget: int = 0
+
+    _dataset_version: int = 0
+    _watching: bool = False
 
     def toggle_areachart(self):
         self.area_toggle = not self.area_toggle
 
-    def randomize_data(self):
-        # If data is already populated, don't randomize
-        if self.users_data:
-            return
+    def set_selected_tab(self, tab: str):
+        """Show the chart of another series."""
+        self.selected_tab = tab
+
+    def set_timeframe(self, timeframe: str):
+        """Switch the charts to the series of another timeframe."""
+        if timeframe in TIMEFRAMES:
+            self.timeframe = timeframe
+            self.load_data()
+
+    def measure_charts(self):
+        """Ask the browser for the width of the charts container."""
+        return rx.call_script(
+            f"document.getElementById('{CHARTS_CONTAINER_ID}').clientWidth",
+            callback=StatsState.set_chart_width,
+        )
+
+    def set_chart_width(self, width: int):
+        """Fit the point budget of the series to a chart ``width`` in pixels.
+
+        The series are always loaded on the first measurement, and again
+        whenever the budget changes.
+        """
+        budget = min(max(int(width) // PIXELS_PER_POINT, MIN_POINTS), MAX_POINTS)
+        if budget != self._point_budget:
+            self._point_budget = budget
+            return self.load_charts()
+
+    def load_charts(self):
+        """Load the series and keep them in step with the items file."""
+        self.load_data()
+        if not self._watching:
+            return StatsState.watch_charts
+
+    def load_data(self):
+        """Select the precomputed series of the current timeframe.
+
+        Each series is downsampled to the point budget; the reduced series
+        are cached per series, timeframe and budget.
+        """
+        self._show(_series(self.timeframe, self._point_budget or DEFAULT_POINTS))
+        self._dataset_version = dataset_version(ITEMS_PATH)
 
-        for i in range(30, -1, -1):  # Include today's data
-            self.revenue_data.append(
-                {
-                    "Date": (
-                        datetime.datetime.now() - datetime.timedelta(days=i)
-                    ).strftime("%m-%d"),
-                    "Revenue": random.randint(1000, 5000),
-                }
-            )
-        for i in range(30, -1, -1):
-            self.orders_data.append(
-                {
-                    "Date": (
-                        datetime.datetime.now() - datetime.timedelta(days=i)
-                    ).strftime("%m-%d"),
-                    "Orders": random.randint(100, 500),
-                }
-            )
-
-        for i in range(30, -1, -1):
-            self.users_data.append(
-                {
-                    "Date": (
-                        datetime.datetime.now() - datetime.timedelta(days=i)
-                    ).strftime("%m-%d"),
-                    "Users": random.randint(100, 500),
-                }
-            )
+        # Device data is static; don't reassign it once populated.
+        if self.device_data:
+            return
 
         self.device_data = [
             {"name": "Desktop", "value": 23, "fill": "var(--blue-8)"},
@@ -67,6 +116,57 @@ class StatsState(rx.State):
             {"name": "Other", "value": 9, "fill": "var(--red-8)"},
         ]
 
+    def _show(self, points: Dict[str, List[Dict[str, Any]]]):
+        self.users_data = points["Items"]
+        self.revenue_data = points["Payments"]
+        self.orders_data = points["Completed"]
+
+    @rx.event(background=True)
+    async def watch_charts(self):
+        """Refresh the series whenever a new version of the dataset is loaded."""
+        async with self:
+            if self._watching:
+                return
+            self._watching = True
+            token = self.router.session.client_token
+            seen = self._dataset_version
+        try:
+            while client_connected(token):
+                await asyncio.sleep(DATASET_POLL_INTERVAL)
+                # The state lock is only taken once the version moved.
+                version = dataset_version(ITEMS_PATH)
+                if version == seen:
+                    continue
+                seen = version
+                async with self:
+                    if version == self._dataset_version:
+                        continue
+                    timeframe = self.timeframe
+                    budget = self._point_budget or DEFAULT_POINTS
+                points = await asyncio.to_thread(_series, timeframe, budget)
+                async with self:
+                    self._dataset_version = version
+                    self._show(points)
+        finally:
+            async with self:
+                self._watching = False
+
+
+def charts_container(*children: rx.Component, **props) -> rx.Component:
+    """Wrap the charts so their point budget follows the container's width.
+
+    The width is measured when the container mounts and again whenever
+    it is resized.
+    """
+    return width_box(
+        *children,
+        id=CHARTS_CONTAINER_ID,
+        width="100%",
+        on_mount=StatsState.measure_charts,
+        on_resize=StatsState.set_chart_width,
+        **props,
+    )
+
 
 def area_toggle() -> rx.Component:
     return rx.cond(
@@ -133,7 +233,7 @@ def users_chart() -> rx.Component:
                 stroke_dasharray="3 3",
             ),
             rx.recharts.area(
-                data_key="Users",
+                data_key="Items",
                 stroke=rx.color("blue", 9),
                 fill="url(#colorBlue)",
                 type_="monotone",
@@ -150,7 +250,7 @@ def users_chart() -> rx.Component:
             ),
             _custom_tooltip("blue"),
             rx.recharts.bar(
-                data_key="Users",
+                data_key="Items",
                 stroke=rx.color("blue", 9),
                 fill=rx.color("blue", 7),
             ),
@@ -173,7 +273,7 @@ def revenue_chart() -> rx.Component:
                 stroke_dasharray="3 3",
             ),
             rx.recharts.area(
-                data_key="Revenue",
+                data_key="Payments",
                 stroke=rx.color("green", 9),
                 fill="url(#colorGreen)",
                 type_="monotone",
@@ -190,7 +290,7 @@ def revenue_chart() -> rx.Component:
                 stroke_dasharray="3 3",
             ),
             rx.recharts.bar(
-                data_key="Revenue",
+                data_key="Payments",
                 stroke=rx.color("green", 9),
                 fill=rx.color("green", 7),
             ),
@@ -213,7 +313,7 @@ def orders_chart() -> rx.Component:
                 stroke_dasharray="3 3",
             ),
             rx.recharts.area(
-                data_key="Orders",
+                data_key="Completed",
                 stroke=rx.color("purple", 9),
                 fill="url(#colorPurple)",
                 type_="monotone",
@@ -230,7 +330,7 @@ def orders_chart() -> rx.Component:
                 stroke_dasharray="3 3",
             ),
             rx.recharts.bar(
-                data_key="Orders",
+                data_key="Completed",
                 stroke=rx.color("purple", 9),
                 fill=rx.color("purple", 7),
             ),
@@ -281,9 +381,47 @@ def pie_chart() -> rx.Component:
 
 def timeframe_select() -> rx.Component:
     return rx.select(
-        ["Monthly", "Yearly"],
+        list(TIMEFRAMES),
         default_value="Monthly",
         value=StatsState.timeframe,
         variant="surface",
         on_change=StatsState.set_timeframe,
     )
+
+
+def charts_card() -> rx.Component:
+    """Card with the item, payment and completed series of the timeframe."""
+    return card(
+        rx.hstack(
+            rx.hstack(
+                rx.icon("trending-up", size=20),
+                rx.text("Items over time", size="4", weight="medium"),
+                align="center",
+                spacing="2",
+            ),
+            rx.hstack(
+                area_toggle(),
+                timeframe_select(),
+                align="center",
+                spacing="2",
+            ),
+            justify="between",
+            align="center",
+            width="100%",
+        ),
+        rx.tabs.root(
+            rx.tabs.list(
+                rx.tabs.trigger("Items", value="users"),
+                rx.tabs.trigger("Payments", value="revenue"),
+                rx.tabs.trigger("Completed", value="orders"),
+            ),
+            charts_container(
+                rx.tabs.content(users_chart(), value="users"),
+                rx.tabs.content(revenue_chart(), value="revenue"),
+                rx.tabs.content(orders_chart(), value="orders"),
+            ),
+            value=StatsState.selected_tab,
+            on_change=StatsState.set_selected_tab,
+            width="100%",
+        ),
+    )
@@ -1,18 +1,38 @@
 import reflex as rx
+import asyncio
 import pandas as pd
-from typing import List, Dict
+from typing import Any, List, Dict
+
+from ..backend.checklist_catalog import ChecklistExistsError, checklists
+from ..backend.checklist_items import create_checklist
+from ..backend.exports import ExportProgress, new_export_file, submit, write_excel
+from ..backend.progress import checklist_id
+
+# Minimum progress options of the overview filter, in percent.
+PROGRESS_THRESHOLDS = ["0", "25", "50", "75", "100"]
 
 
 class ChecklistState(rx.State):
     """State to manage the checklist view."""
 
-    checklists: List[Dict[str, str]] = [
-        {"Name": "Checklist 1", "Owner": "Area 1", "Status": "Completed", "Progress": "100%"},
-        {"Name": "Checklist 2", "Owner": "Area 2", "Status": "In Progress", "Progress": "50%"},
-        {"Name": "Checklist 3", "Owner": "Area 3", "Status": "Pending", "Progress": "0%"},
-    ]
+    # Checklist summaries with integer Done/Total item counters and Progress,
+    # read from the shared catalog when the overview loads. Kept on the
+    # backend: the page only receives ``filtered_checklists``.
+    _checklists: List[Dict[str, Any]] = []
     search_term: str = ""
     status_filter: str = "All"
+    min_progress: int = 0
+    sort_by_progress: bool = False
+    exporting: bool = False
+    # Fields of the create page.
+    new_project_name: str = ""
+    new_checklist_items: str = ""
+    new_owner: str = "Area 1"
+    create_error: str = ""
+
+    def load_checklists(self):
+        """Read the checklist summaries from the shared catalog."""
+        self._checklists = checklists()
 
     def set_search_term(self, value: str):
         """Update the search term."""
@@ -22,24 +42,115 @@ class ChecklistState(rx.State):
         """Update the status filter."""
         self.status_filter = value
 
-    @rx.var
-    def filtered_checklists(self) -> List[Dict[str, str]]:
-        """Return the filtered list of checklists."""
-        filtered = self.checklists
+    def set_min_progress(self, value: str):
+        """Only show checklists with at least ``value`` percent progress."""
+        self.min_progress = int(value)
+
+    def toggle_progress_sort(self):
+        """Toggle sorting the checklists by progress, most advanced first."""
+        self.sort_by_progress = not self.sort_by_progress
+
+    # The checklists are read unproxied with ``get_value``, which is not
+    # tracked, so the dependency is declared.
+    @rx.var(cache=True, deps=["_checklists"], auto_deps=False)
+    def _status_index(self) -> Dict[str, List[int]]:
+        """Positions of the checklists with each status, rebuilt with ``_checklists``."""
+        checklists = self.get_value("_checklists")
+        index: Dict[str, List[int]] = {"All": list(range(len(checklists)))}
+        for position, checklist in enumerate(checklists):
+            index.setdefault(checklist["Status"], []).append(position)
+        return index
+
+    @rx.var(cache=True, deps=["_checklists"], auto_deps=False)
+    def _progress_order(self) -> List[int]:
+        """Checklist positions from most to least progress."""
+        checklists = self.get_value("_checklists")
+        return sorted(
+            range(len(checklists)),
+            key=lambda i: checklists[i]["Progress"],
+            reverse=True,
+        )
+
+    @rx.var(cache=True, deps=["_checklists"], auto_deps=False)
+    def _lower_names(self) -> List[str]:
+        """Lower-cased checklist names, rebuilt with ``_checklists``."""
+        return [checklist["Name"].lower() for checklist in self.get_value("_checklists")]
+
+    @rx.var(cache=True, deps=["_checklists"])
+    def filtered_checklists(self) -> List[Dict[str, Any]]:
+        """Return the filtered list of checklists.
+
+        Only the status bucket is scanned, and the search is matched against
+        the pre-lower-cased names. Progress is compared and sorted as numbers.
+        """
+        checklists = self.get_value("_checklists")
+        positions = self._status_index.get(self.status_filter, [])
         if self.search_term:
-            filtered = [
-                c for c in filtered if self.search_term.lower() in c["Name"].lower()
+            term = self.search_term.lower()
+            names = self._lower_names
+            positions = [i for i in positions if term in names[i]]
+        if self.min_progress:
+            positions = [
+                i for i in positions if checklists[i]["Progress"] >= self.min_progress
             ]
-        if self.status_filter != "All":
-            filtered = [c for c in filtered if c["Status"] == self.status_filter]
-        return filtered
+        if self.sort_by_progress:
+            selected = set(positions)
+            positions = [i for i in self._progress_order if i in selected]
+        return [checklists[i] for i in positions]
 
     def go_to_create_page(self):
         """Redirect to the checklist creation page."""
-        rx.redirect("/create-checklist")
+        return rx.redirect("/create-checklist")
+
+    def set_new_project_name(self, value: str):
+        """Update the name of the checklist being created."""
+        self.new_project_name = value
+
+    def set_new_checklist_items(self, value: str):
+        """Update the item lines of the checklist being created."""
+        self.new_checklist_items = value
+
+    def set_new_owner(self, value: str):
+        """Update the owner of the checklist being created."""
+        self.new_owner = value
+
+    def save_checklist(self):
+        """Store the new checklist's items in one batch and add its summary.
+
+        The overview reloads the summaries from the catalog on load, so the
+        new one reaches the page once, with the redirect.
+        """
+        name = self.new_project_name.strip()
+        if not name:
+            self.create_error = "Enter a project name."
+            return
+        if not checklist_id(name):
+            self.create_error = "The project name needs a letter or digit."
+            return
+        try:
+            create_checklist(name, self.new_owner, self.new_checklist_items)
+        except ChecklistExistsError as e:
+            self.create_error = str(e)
+            return
+        self.new_project_name = ""
+        self.new_checklist_items = ""
+        self.create_error = ""
+        return rx.redirect("/")
 
-    def download_checklists(self):
-        """Download the checklist data as an Excel file."""
-        df = pd.DataFrame(self.checklists)
-        df.to_excel("checklists.xlsx", index=False)
-        rx.download("checklists.xlsx")
+    @rx.event(background=True)
+    async def download_checklists(self):
+        """Download the checklist data as an Excel file, written in the background."""
+        async with self:
+            if self.exporting:
+                return
+            self.exporting = True
+            df = pd.DataFrame(self._checklists)
+        try:
+            path, url = new_export_file(".xlsx")
+            await asyncio.wrap_future(
+                submit(write_excel, [df], list(df.columns), path, ExportProgress(len(df)))
+            )
+        finally:
+            async with self:
+                self.exporting = False
+        return rx.download(url=url, filename="checklists.xlsx")
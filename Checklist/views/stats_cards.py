@@ -1,25 +1,112 @@
+import asyncio
+import datetime
+
 import reflex as rx
 from .. import styles
+from ..backend.dataset_cache import dataset_version, start_watcher
+from ..backend.rollups import Totals, month_over_month
+from ..backend.table_state import (
+    DATASET_POLL_INTERVAL,
+    ITEMS_PATH,
+    client_connected,
+)
 
 from reflex.components.radix.themes.base import LiteralAccentColor
 
 
+class Kpi(rx.Base):
+    """A figure of this month compared with last month."""
+
+    text: str = "0"
+    change: str = "0%"
+    increased: bool = False
+
+
+def _kpi(value: float, prev_value: float, extra_char: str = "") -> Kpi:
+    if prev_value:
+        change = f"{round((value - prev_value) / prev_value * 100, 2)}%"
+    else:
+        change = "0%" if not value else "new"
+    return Kpi(
+        text=f"{extra_char}{value:,.2f}" if extra_char else f"{value:,.0f}",
+        change=change,
+        increased=value > prev_value,
+    )
+
+
+class KpiState(rx.State):
+    """Month-over-month figures of the item data for the stats cards."""
+
+    items: Kpi = Kpi()
+    payments: Kpi = Kpi()
+    completed: Kpi = Kpi()
+
+    _dataset_version: int = 0
+    _watching: bool = False
+
+    def load_kpis(self):
+        """Read this and last month's totals from the running rollups.
+
+        The items file is watched as the table does, so the version polled
+        by ``watch_kpis`` moves even when no table page is open.
+        """
+        try:
+            this_month, last_month = month_over_month(
+                ITEMS_PATH, datetime.date.today()
+            )
+            start_watcher(ITEMS_PATH)
+        except (FileNotFoundError, KeyError, ValueError):
+            this_month = last_month = Totals(0, 0.0, 0)
+        self._dataset_version = dataset_version(ITEMS_PATH)
+        self._show(this_month, last_month)
+        if not self._watching:
+            return KpiState.watch_kpis
+
+    def _show(self, this_month: Totals, last_month: Totals):
+        self.items = _kpi(this_month.count, last_month.count)
+        self.payments = _kpi(this_month.payment, last_month.payment, "$")
+        self.completed = _kpi(this_month.completed, last_month.completed)
+
+    @rx.event(background=True)
+    async def watch_kpis(self):
+        """Refresh the figures whenever a new version of the dataset is loaded."""
+        async with self:
+            if self._watching:
+                return
+            self._watching = True
+            token = self.router.session.client_token
+            seen = self._dataset_version
+        try:
+            while client_connected(token):
+                await asyncio.sleep(DATASET_POLL_INTERVAL)
+                # The state lock is only taken once the version moved.
+                version = dataset_version(ITEMS_PATH)
+                if version == seen:
+                    continue
+                seen = version
+                async with self:
+                    if version == self._dataset_version:
+                        continue
+                try:
+                    totals = await asyncio.to_thread(
+                        month_over_month, ITEMS_PATH, datetime.date.today()
+                    )
+                except (FileNotFoundError, KeyError, ValueError):
+                    continue
+                async with self:
+                    self._dataset_version = version
+                    self._show(*totals)
+        finally:
+            async with self:
+                self._watching = False
+
+
 def stats_card(
     stat_name: str,
-    value: int,
-    prev_value: int,
+    kpi: Kpi,
     icon: str,
     icon_color: LiteralAccentColor,
-    extra_char: str = "",
 ) -> rx.Component:
-    percentage_change = (
-        round(((value - prev_value) / prev_value) * 100, 2)
-        if prev_value != 0
-        else 0 if value == 0 else float("inf")
-    )
-    change = "increase" if value > prev_value else "decrease"
-    arrow_icon = "trending-up" if value > prev_value else "trending-down"
-    arrow_color = "grass" if value > prev_value else "tomato"
     return rx.card(
         rx.vstack(
             rx.hstack(
@@ -31,7 +118,7 @@ def stats_card(
                 ),
                 rx.vstack(
                     rx.heading(
-                        f"{extra_char}{value:,}",
+                        kpi.text,
                         size="6",
                         weight="bold",
                     ),
@@ -48,22 +135,29 @@ def stats_card(
             ),
             rx.hstack(
                 rx.hstack(
-                    rx.icon(
-                        tag=arrow_icon,
-                        size=24,
-                        color=rx.color(arrow_color, 9),
+                    rx.cond(
+                        kpi.increased,
+                        rx.icon(
+                            tag="trending-up", size=24, color=rx.color("grass", 9)
+                        ),
+                        rx.icon(
+                            tag="trending-down", size=24, color=rx.color("tomato", 9)
+                        ),
                     ),
                     rx.text(
-                        f"{percentage_change}%",
+                        kpi.change,
                         size="3",
-                        color=rx.color(arrow_color, 9),
+                        color=rx.cond(
+                            kpi.increased, rx.color("grass", 9), rx.color("tomato", 9)
+                        ),
                         weight="medium",
                     ),
                     spacing="2",
                     align="center",
                 ),
                 rx.text(
-                    f"{change} from last month",
+                    rx.cond(kpi.increased, "increase", "decrease"),
+                    " from last month",
                     size="2",
                     color=rx.color("gray", 10),
                 ),
@@ -80,25 +174,21 @@ def stats_card(
 def stats_cards() -> rx.Component:
     return rx.grid(
         stats_card(
-            stat_name="Users",
-            value=4200,
-            prev_value=3000,
-            icon="users",
+            stat_name="Items this month",
+            kpi=KpiState.items,
+            icon="list-checks",
             icon_color="blue",
         ),
         stats_card(
-            stat_name="Revenue",
-            value=12000,
-            prev_value=15000,
+            stat_name="Payments",
+            kpi=KpiState.payments,
             icon="dollar-sign",
             icon_color="green",
-            extra_char="$",
         ),
         stats_card(
-            stat_name="Orders",
-            value=300,
-            prev_value=250,
-            icon="shopping-cart",
+            stat_name="Completed",
+            kpi=KpiState.completed,
+            icon="circle-check",
             icon_color="purple",
         ),
         gap="1rem",
@@ -1,5 +1,19 @@
 import reflex as rx
-from ..backend.table_state import TableState, Item
+from ..backend.table_state import (
+    TableState,
+    Item,
+    PAGE_SIZES,
+    VIRTUAL_ROW_HEIGHT,
+    VIRTUAL_VIEWPORT_ROWS,
+)
+from ..backend.validation import VALID_STATUSES as STATUSES
+from ..components.scroll_box import scroll_box
+
+
+# Upload id of the evidence drop zone; a row's attach button sets its task.
+# Reflex hoists an upload's dropzone hook to the page, so it cannot live in
+# the rows of a ``foreach`` and know which row it belongs to.
+EVIDENCE_UPLOAD_ID = "evidence_upload"
 
 
 def _header_cell(text: str, icon: str) -> rx.Component:
@@ -20,13 +34,28 @@ def _show_item(item: Item, index: int) -> rx.Component:
         rx.table.row_header_cell(item.name),
         rx.table.cell(f"${item.payment}"),
         rx.table.cell(item.date),
-        rx.table.cell(item.status),
         rx.table.cell(
-            rx.input(
-                type="file",
-                on_change=lambda e: TableState.upload_evidence(item.name, e),
-                size="2",  # Cambio 'sm' a un valor válido: '1', '2', o '3'
+            rx.cond(
+                TableState.checklist_id,
+                rx.select(
+                    STATUSES,
+                    value=item.status,
+                    on_change=lambda status: TableState.set_item_status(
+                        item.row, status
+                    ),
+                    size="1",
+                ),
+                rx.text(item.status),
+            )
+        ),
+        rx.table.cell(
+            rx.icon_button(
+                rx.icon("paperclip", size=16),
+                size="1",
+                variant=rx.cond(TableState.evidence_task == item.name, "solid", "soft"),
+                on_click=TableState.set_evidence_task(item.name),
             ),
+            rx.badge(TableState.evidence_counts[item.name], variant="soft"),
             justify="center",
         ),
         style={
@@ -36,9 +65,102 @@ def _show_item(item: Item, index: int) -> rx.Component:
     )
 
 
+def _evidence_drop_zone() -> rx.Component:
+    """Drop zone uploading evidence to the task chosen in the table."""
+    return rx.upload(
+        rx.text(
+            rx.cond(
+                TableState.evidence_task,
+                f"Drop evidence for {TableState.evidence_task} here, or click to browse",
+                "Choose a task with its attach button to upload evidence",
+            ),
+            size="2",
+        ),
+        id=EVIDENCE_UPLOAD_ID,
+        multiple=True,
+        disabled=TableState.evidence_task == "",
+        on_drop=TableState.upload_evidence(
+            rx.upload_files(upload_id=EVIDENCE_UPLOAD_ID)
+        ),
+        border="1px dashed var(--gray-8)",
+        padding="1em",
+        width="100%",
+    )
+
+
+def _table_header() -> rx.Component:
+    """Header row of the checklist table."""
+    return rx.table.header(
+        rx.table.row(
+            _header_cell("Task Name", "task"),
+            _header_cell("Payment", "dollar-sign"),
+            _header_cell("Date", "calendar"),
+            _header_cell("Status", "check-circle"),
+            _header_cell("Evidence", "upload"),
+        ),
+    )
+
+
+def _paged_table() -> rx.Component:
+    """The current page of the checklist table."""
+    return rx.table.root(
+        _table_header(),
+        rx.table.body(
+            rx.foreach(
+                TableState.get_current_page,
+                lambda item, index: _show_item(item, index),
+            )
+        ),
+    )
+
+
+def _virtual_table() -> rx.Component:
+    """Infinite-scroll table rendering only the windows under the viewport.
+
+    Spacer rows stand in for the rows above and below, so the DOM holds the
+    same number of rows however far the table is scrolled.
+    """
+    return scroll_box(
+        rx.table.root(
+            _table_header(),
+            rx.table.body(
+                rx.table.row(style={"height": TableState.window_padding_top}),
+                rx.foreach(
+                    TableState.window_rows,
+                    lambda item, index: _show_item(item, index),
+                ),
+                rx.table.row(style={"height": TableState.window_padding_bottom}),
+            ),
+            style={
+                "& tbody tr": {"height": f"{VIRTUAL_ROW_HEIGHT}px"},
+                "& thead th": {
+                    "position": "sticky",
+                    "top": "0",
+                    "background": "var(--color-background)",
+                    "z_index": "1",
+                },
+            },
+        ),
+        on_scroll=TableState.scroll_rows.throttle(100),
+        height=f"{VIRTUAL_ROW_HEIGHT * VIRTUAL_VIEWPORT_ROWS}px",
+        overflow_y="auto",
+    )
+
+
 def _pagination_view() -> rx.Component:
     """Pagination controls for the checklist table."""
     return rx.hstack(
+        rx.hstack(
+            rx.text("Rows per page"),
+            rx.select(
+                [str(size) for size in PAGE_SIZES],
+                value=TableState.limit.to_string(),
+                on_change=TableState.set_page_size,
+                size="1",
+            ),
+            align="center",
+            spacing="2",
+        ),
         rx.text(
             "Page ",
             rx.code(TableState.page_number),
@@ -71,34 +193,67 @@ def checklist_table() -> rx.Component:
                 size="2",  # Cambio 'sm' a un valor válido
                 max_width="250px",
             ),
-            rx.button(
-                "Export to Excel",
-                on_click=TableState.export_to_excel,
-                color="white",
-                background_color="green",
-                hover={"background_color": "darkgreen"},
+            rx.hstack(
+                rx.switch(
+                    checked=TableState.virtual_mode,
+                    on_change=TableState.set_virtual_mode,
+                ),
+                rx.text("Infinite scroll", size="2"),
+                align="center",
+                spacing="2",
+            ),
+            rx.hstack(
+                rx.cond(
+                    TableState.exporting,
+                    rx.text(f"Exporting... {TableState.export_progress}%"),
+                    rx.text(TableState.last_export, size="1", color_scheme="gray"),
+                ),
+                rx.button(
+                    "Export to Excel",
+                    on_click=TableState.export_to_excel,
+                    disabled=TableState.exporting,
+                    color="white",
+                    background_color="green",
+                    hover={"background_color": "darkgreen"},
+                ),
+                rx.menu.root(
+                    rx.menu.trigger(
+                        rx.button(
+                            "Export as",
+                            rx.icon("chevron-down", size=16),
+                            disabled=TableState.exporting,
+                            variant="outline",
+                        ),
+                    ),
+                    rx.menu.content(
+                        rx.menu.item(
+                            "CSV (gzip)",
+                            on_click=TableState.export_view("csv.gz"),
+                        ),
+                        rx.menu.item(
+                            "Parquet",
+                            on_click=TableState.export_view("parquet"),
+                        ),
+                        rx.menu.item(
+                            "Arrow IPC",
+                            on_click=TableState.export_view("arrow"),
+                        ),
+                    ),
+                ),
+                align="center",
+                spacing="2",
             ),
             justify="between",  # Cambio 'space-between' a 'between'
             wrap="wrap",
             width="100%",
         ),
-        rx.table.root(
-            rx.table.header(
-                rx.table.row(
-                    _header_cell("Task Name", "task"),
-                    _header_cell("Payment", "dollar-sign"),
-                    _header_cell("Date", "calendar"),
-                    _header_cell("Status", "check-circle"),
-                    _header_cell("Evidence", "upload"),
-                ),
-            ),
-            rx.table.body(
-                rx.foreach(
-                    TableState.get_current_page,
-                    lambda item, index: _show_item(item, index),
-                )
-            ),
+        rx.cond(TableState.virtual_mode, _virtual_table(), _paged_table()),
+        _evidence_drop_zone(),
+        rx.text(TableState.evidence_message, size="2"),
+        rx.cond(
+            TableState.virtual_mode,
+            rx.text(f"{TableState.filtered_items} rows", margin_top="1rem"),
+            _pagination_view(),
         ),
-        _pagination_view(),
         width="100%",
     )
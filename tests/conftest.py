@@ -0,0 +1,92 @@
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+import reflex as rx
+from reflex.config import get_config
+from reflex.state import RouterData, StateManagerMemory, StateProxy
+from reflex.utils import prerequisites
+
+from Checklist.backend.dataset_cache import clear_cache
+from Checklist.backend.item_store import COLUMNS
+from Checklist.backend.partitions import clear_partitions
+
+# Read rxconfig.py now: tests change the working directory before the app
+# is first imported.
+get_config()
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """Start and end every test without cached datasets or partitions."""
+    clear_cache()
+    clear_partitions()
+    yield
+    clear_cache()
+    clear_partitions()
+
+
+@pytest.fixture
+def make_items():
+    """Return a factory of valid item rows with repeated payments, dates and statuses."""
+
+    def make(count: int, start: int = 0, seed: int = 0) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        rows = np.arange(start, start + count)
+        return pd.DataFrame(
+            {
+                "name": [f"item {i % 37} task{i}" for i in rows],
+                "payment": rng.integers(1, 20, count).astype(float),
+                "date": [f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}" for i in rows],
+                "status": rng.choice(["Pending", "Completed", "In Progress"], count),
+            },
+            columns=COLUMNS,
+        )
+
+    return make
+
+
+@pytest.fixture
+def new_state():
+    """Return a factory of states of a given class, each in its own session."""
+
+    def new(cls):
+        root = rx.State(_reflex_internal_init=True)
+        root.router = RouterData({"token": uuid.uuid4().hex})
+        return root.get_substate(cls.get_full_name().split(".")[1:])
+
+    return new
+
+
+class _EventNamespace:
+    """Stands in for the websocket, recording the deltas sent to clients."""
+
+    def __init__(self):
+        self.token_to_sid = {}
+        self.deltas = []
+
+    async def emit_update(self, update, sid):
+        self.deltas.append(update.delta)
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """The app with in-memory sessions, so background events can run."""
+    app = prerequisites.get_app().app
+    monkeypatch.setattr(app, "_state_manager", StateManagerMemory.create(state=rx.State))
+    monkeypatch.setattr(app, "event_namespace", _EventNamespace())
+    return app
+
+
+@pytest.fixture
+def new_background_state(app, new_state):
+    """Return a factory of state proxies that background events can lock."""
+
+    def new(cls):
+        state = new_state(cls)
+        root = state._get_root_state()
+        app.state_manager.states[root.router.session.client_token] = root
+        return StateProxy(state)
+
+    return new
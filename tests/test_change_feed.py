@@ -0,0 +1,43 @@
+import numpy as np
+
+from Checklist.backend.change_feed import ChangeLog, appended, diff_stores
+from Checklist.backend.item_store import ItemStore
+
+
+def _store(rows):
+    names, payments, statuses = zip(*rows)
+    return ItemStore(names, payments, ["2024-01-01"] * len(rows), statuses)
+
+
+def test_diff_stores_matches_rows_by_name_and_occurrence():
+    old = _store(
+        [("a", 1.0, "Pending"), ("b", 2.0, "Pending"), ("b", 3.0, "Pending"), ("c", 4.0, "Pending")]
+    )
+    new = _store(
+        [("b", 2.0, "Completed"), ("a", 1.0, "Pending"), ("b", 3.0, "Pending"), ("d", 5.0, "Pending")]
+    )
+    change = diff_stores(7, old, new)
+    assert change.version == 7
+    assert not change.appended_only
+    assert change.inserted.tolist() == [3]
+    # The first "b" changed status; the second is the same row.
+    assert change.updated.tolist() == [0]
+    assert change.replaced.tolist() == [1]
+    assert change.deleted.tolist() == [3]
+    assert change.row_count == 3
+
+
+def test_diff_of_identical_stores_is_empty():
+    store = _store([("a", 1.0, "Pending"), ("a", 1.0, "Pending")])
+    assert diff_stores(2, store, store).row_count == 0
+
+
+def test_change_log_reports_gaps():
+    log = ChangeLog(size=2)
+    for version in (2, 3, 4):
+        log.record(appended(version, 0, 1))
+    assert [change.version for change in log.since(3)] == [4]
+    assert log.since(4) == []
+    # Version 2 was dropped, so the changes after 1 are no longer known.
+    assert log.since(1) is None
+    assert np.array_equal(appended(2, 3, 5).inserted, [3, 4])
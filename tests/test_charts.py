@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from Checklist.backend.dataset_cache import append_rows, load_snapshot
+from Checklist.components.width_box import WidthBox
+from Checklist.views import charts
+from Checklist.views.charts import (
+    CHARTS_CONTAINER_ID,
+    DEFAULT_POINTS,
+    StatsState,
+    charts_card,
+)
+
+
+@pytest.fixture
+def items(tmp_path, monkeypatch, make_items):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(charts, "start_watcher", lambda path: None)
+    append_rows("items.csv", make_items(100))
+
+
+def _total(points, series):
+    return sum(point[series] for point in points)
+
+
+def test_first_measurement_always_loads(items, new_state):
+    state = new_state(StatsState)
+    assert StatsState.set_chart_width.fn(state, DEFAULT_POINTS * 4) == StatsState.watch_charts
+    assert _total(state.users_data, "Items") == 100
+    state.users_data = []
+    assert StatsState.set_chart_width.fn(state, DEFAULT_POINTS * 4 + 1) is None
+    assert state.users_data == []
+
+
+def test_charts_follow_the_dataset(items, monkeypatch, new_background_state, make_items):
+    proxy = new_background_state(StatsState)
+    StatsState.load_charts.fn(proxy.__wrapped__)
+    monkeypatch.setattr(charts, "DATASET_POLL_INTERVAL", 0.01)
+    polls = iter([True, True])
+    monkeypatch.setattr(charts, "client_connected", lambda token: next(polls, False))
+    append_rows("items.csv", make_items(20, start=100))
+    load_snapshot("items.csv")
+    asyncio.run(StatsState.watch_charts.fn(proxy))
+    state = proxy.__wrapped__
+    assert _total(state.users_data, "Items") == 120
+    assert not state._watching
+
+
+def test_charts_are_drawn_in_the_measured_container():
+    boxes = []
+
+    def find(component):
+        if isinstance(component, WidthBox):
+            boxes.append(component)
+        for child in component.children:
+            find(child)
+
+    find(charts_card())
+    [box] = boxes
+    assert box.id == CHARTS_CONTAINER_ID
+    assert {"on_mount", "on_resize"} <= set(box.event_triggers)
+    assert "ResizeObserver" in "".join(box.add_hooks())
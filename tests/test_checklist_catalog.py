@@ -0,0 +1,89 @@
+import datetime
+
+import pytest
+
+from Checklist.backend import checklist_catalog
+from Checklist.backend.checklist_catalog import (
+    ChecklistExistsError,
+    add_checklist,
+    checklists,
+    open_checklist,
+    set_item_status,
+)
+from Checklist.backend.checklist_items import items_frame
+from Checklist.backend.partitions import clear_partitions, load_partition, partition_path
+from Checklist.backend.table_state import TableState
+
+
+@pytest.fixture
+def checklist(tmp_path, monkeypatch):
+    """A checklist of four pending items, two of them named alike."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(checklist_catalog, "_summaries", None)
+    names = ["Audit", "Review", "Review", "Sign off"]
+    add_checklist("Launch plan", "Area 1", items_frame(names, datetime.date(2024, 5, 1)))
+    return "launch-plan"
+
+
+def _counters(checklist_id):
+    (summary,) = [c for c in checklists() if c["Id"] == checklist_id]
+    return summary["Done"], summary["Total"], summary["Status"]
+
+
+def test_new_checklists_are_written_in_one_partition(checklist):
+    store = open_checklist(checklist)
+    assert store.name.tolist() == ["Audit", "Review", "Review", "Sign off"]
+    assert _counters(checklist) == (0, 4, "Pending")
+    checklist_catalog._summaries = None
+    assert [c["Id"] for c in checklists()] == [checklist]
+
+
+@pytest.mark.parametrize("name", ["Launch plan", "launch-plan", " LAUNCH  plan! "])
+def test_duplicate_ids_are_rejected(checklist, name):
+    with pytest.raises(ChecklistExistsError):
+        add_checklist(name, "Area 2", items_frame(["Other"], datetime.date(2024, 5, 2)))
+    assert len(checklists()) == 1
+    assert open_checklist(checklist).name.tolist()[-1] == "Sign off"
+
+
+def test_status_change_updates_store_and_counters_in_place(checklist):
+    store = open_checklist(checklist)
+    with open(partition_path(checklist), "rb") as file:
+        items = file.read()
+    set_item_status(checklist, 2, "Completed")
+    assert load_partition(checklist) is store
+    assert store.status.tolist() == ["Pending", "Pending", "Completed", "Pending"]
+    assert _counters(checklist) == (1, 4, "In Progress")
+    set_item_status(checklist, 2, "In Progress")
+    assert _counters(checklist) == (0, 4, "Pending")
+    set_item_status(checklist, 0, "Completed")
+    # Only the change is written: the items file is untouched.
+    with open(partition_path(checklist), "rb") as file:
+        assert file.read() == items
+
+
+def test_status_changes_survive_a_reload(checklist, monkeypatch):
+    set_item_status(checklist, 1, "Completed")
+    set_item_status(checklist, 3, "Completed")
+    set_item_status(checklist, 3, "In Progress")
+    clear_partitions()
+    monkeypatch.setattr(checklist_catalog, "_summaries", None)
+    store = open_checklist(checklist)
+    assert store.status.tolist() == ["Pending", "Completed", "Pending", "In Progress"]
+    assert _counters(checklist) == (1, 4, "In Progress")
+
+
+def test_items_with_the_same_name_are_told_apart(checklist, new_state):
+    state = new_state(TableState)
+    state.checklist_id = checklist
+    state._refresh_view()
+    second = [item for item in state.get_current_page if item.name == "Review"][1]
+    TableState.set_item_status.fn(state, second.row, "Completed")
+    assert [item.status for item in state.get_current_page] == [
+        "Pending",
+        "Pending",
+        "Completed",
+        "Pending",
+    ]
+    TableState.set_item_status.fn(state, 99, "Completed")
+    assert _counters(checklist) == (1, 4, "In Progress")
@@ -0,0 +1,41 @@
+from Checklist.backend import checklist_catalog
+from Checklist.backend.checklist_catalog import checklists
+from Checklist.views.checklist_state import ChecklistState
+
+
+def _summary(name, status, progress):
+    return {"Id": name.lower(), "Name": name, "Status": status, "Progress": progress}
+
+
+def test_only_the_filtered_checklists_are_sent(new_state):
+    state = new_state(ChecklistState)
+    root = state._get_root_state()
+    root._clean()
+    state._checklists = [_summary("Alpha", "Pending", 0), _summary("Beta", "Completed", 100)]
+    state.status_filter = "Completed"
+    delta = root.get_delta()[ChecklistState.get_full_name()]
+    assert "_checklists" not in delta
+    assert [c["Name"] for c in delta["filtered_checklists"]] == ["Beta"]
+    root._clean()
+    state._checklists.append(_summary("Gamma", "Completed", 100))
+    delta = root.get_delta()[ChecklistState.get_full_name()]
+    assert [c["Name"] for c in delta["filtered_checklists"]] == ["Beta", "Gamma"]
+
+
+def test_saving_a_checklist_sends_it_once(tmp_path, monkeypatch, new_state):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(checklist_catalog, "_summaries", None)
+    state = new_state(ChecklistState)
+    state.new_project_name = "Launch plan"
+    state.new_checklist_items = "Audit\n\n  Review  \nSign off\n"
+    event = ChecklistState.save_checklist.fn(state)
+    assert event.handler.fn.__qualname__ == "_redirect"
+    assert {str(key): str(value) for key, value in event.args}["path"] == '"/"'
+    # The overview loads the new summary; the handler leaves it alone.
+    assert state._checklists == []
+    assert (state.new_project_name, state.new_checklist_items) == ("", "")
+    [created] = checklists()
+    assert (created["Name"], created["Total"]) == ("Launch plan", 3)
+    state.new_project_name = "launch  PLAN"
+    assert ChecklistState.save_checklist.fn(state) is None
+    assert "already exists" in state.create_error
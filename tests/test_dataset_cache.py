@@ -0,0 +1,114 @@
+import pytest
+
+from Checklist.backend.dataset_cache import (
+    append_rows,
+    cache_stats,
+    dataset_changes,
+    dataset_report,
+    load_dataset,
+    load_snapshot,
+)
+
+
+@pytest.fixture
+def items_path(tmp_path, make_items):
+    path = str(tmp_path / "items.csv")
+    append_rows(path, make_items(100))
+    return path
+
+
+def test_unchanged_file_is_a_hit(items_path):
+    first = load_dataset(items_path)
+    assert load_dataset(items_path) is first
+    assert cache_stats()["hits"] == 1
+    assert cache_stats()["entries"] == 1
+
+
+def test_snapshot_is_read_only(items_path):
+    store = load_dataset(items_path)
+    with pytest.raises(ValueError):
+        store.payment[0] = 1.0
+
+
+def test_failures_are_not_cached(tmp_path):
+    path = str(tmp_path / "items.csv")
+    with pytest.raises(FileNotFoundError):
+        load_dataset(path)
+    open(path, "w").close()
+    with pytest.raises(ValueError):
+        load_dataset(path)
+    assert cache_stats()["entries"] == 0
+
+
+def _write(path, text, mode="a"):
+    with open(path, mode, encoding="utf-8", newline="") as file:
+        file.write(text)
+
+
+def test_appended_lines_extend_the_snapshot(items_path, make_items):
+    store, version = load_snapshot(items_path)
+    store.search("item 1")
+    append_rows(items_path, make_items(20, start=100))
+    merged, new_version = load_snapshot(items_path)
+    assert (len(merged), new_version) == (120, version + 1)
+    assert merged.search_index() is not store.search_index()
+    [change] = dataset_changes(items_path, version)
+    assert change.appended_only
+    assert change.inserted.tolist() == list(range(100, 120))
+    assert cache_stats()["appends"] == 1
+
+
+def test_partial_line_waits_for_its_newline(items_path):
+    _, version = load_snapshot(items_path)
+    _write(items_path, "late item,3.5,2024-05")
+    assert load_snapshot(items_path)[1] == version
+    _write(items_path, "-06,Pending\n")
+    store, new_version = load_snapshot(items_path)
+    assert new_version == version + 1
+    assert store.name[-1] == "late item"
+
+
+def test_rejected_rows_do_not_bump_the_version(items_path, make_items):
+    store, version = load_snapshot(items_path)
+    _write(items_path, "bad,-1,2024-01-01,Pending\nworse,1,2024-01-01,Unknown\n")
+    assert load_snapshot(items_path) == (store, version)
+    assert dataset_changes(items_path, version) == []
+    assert dataset_report(items_path).rejected_count == 2
+    append_rows(items_path, make_items(1, start=100))
+    assert load_snapshot(items_path)[1] == version + 1
+
+
+def test_rewritten_file_is_reloaded_and_diffed(items_path):
+    _, version = load_snapshot(items_path)
+    with open(items_path, encoding="utf-8") as file:
+        lines = file.readlines()
+    lines[1] = lines[1].replace("item", "renamed item", 1)
+    del lines[2]
+    _write(items_path, "".join(lines), mode="w")
+    store, new_version = load_snapshot(items_path)
+    assert (len(store), new_version) == (99, version + 1)
+    [change] = dataset_changes(items_path, version)
+    assert not change.appended_only
+    assert change.inserted.tolist() == [0]
+    assert change.deleted.tolist() == [0, 1]
+    assert cache_stats()["reloads"] == 1
+
+
+def test_changed_header_reloads(items_path):
+    _, version = load_snapshot(items_path)
+    with open(items_path, encoding="utf-8") as file:
+        text = file.read()
+    _write(items_path, text.replace("name,payment", "name,payment ", 1), mode="w")
+    with pytest.raises(KeyError):
+        load_dataset(items_path)
+
+
+def test_missing_final_newline_reloads(tmp_path):
+    path = str(tmp_path / "items.csv")
+    _write(path, "name,payment,date,status\na,1,2024-01-01,Pending")
+    _, version = load_snapshot(path)
+    _write(path, "\nb,2,2024-01-02,Pending\n")
+    store, new_version = load_snapshot(path)
+    assert store.name.tolist() == ["a", "b"]
+    assert new_version == version + 1
+    assert cache_stats()["reloads"] == 1
@@ -0,0 +1,27 @@
+import numpy as np
+
+from Checklist.backend.downsample import lttb
+
+
+def test_small_series_are_kept_whole():
+    x = np.arange(10)
+    assert lttb(x, x, 10).tolist() == list(range(10))
+    assert lttb(x, x, 50).tolist() == list(range(10))
+
+
+def test_tiny_budgets_keep_the_ends():
+    x = np.arange(10)
+    assert lttb(x, x, 2).tolist() == [0, 9]
+    assert lttb(x, x, 1).tolist() == [0]
+
+
+def test_budget_is_met_and_peaks_survive():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50)
+    y[437] = 25.0
+    y[801] = -25.0
+    kept = lttb(x, y, 60)
+    assert len(kept) == 60
+    assert kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+    assert 437 in kept and 801 in kept
@@ -0,0 +1,52 @@
+import asyncio
+import io
+
+import pytest
+import reflex as rx
+
+from Checklist.backend import evidence
+
+
+@pytest.fixture
+def store(tmp_path):
+    return evidence.EvidenceStore(tmp_path / "evidence")
+
+
+def _upload(data: bytes, filename: str) -> rx.UploadFile:
+    return rx.UploadFile(io.BytesIO(data), filename=filename)
+
+
+def test_content_is_stored_once(store):
+    records = asyncio.run(
+        store.save_many(
+            "session",
+            "Item 1",
+            [_upload(b"same", "a.txt"), _upload(b"same", "b.txt"), _upload(b"x", "c.txt")],
+        )
+    )
+    assert sorted(record.stored for record in records) == [False, True, True]
+    assert records[0].sha256 == records[1].sha256
+    assert store.object_path(records[0].sha256).read_bytes() == b"same"
+    assert len(list(store.objects_dir.rglob("*"))) == 4  # 2 dirs, 2 objects
+    assert not any(store.tmp_dir.iterdir())
+    # Attaching the same content to a task again only refreshes it.
+    assert len(store.attachments("Item 1")) == 2
+
+
+def test_store_lives_outside_the_upload_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(evidence, "_store", None)
+    legacy = rx.get_upload_dir() / "evidence"
+    (legacy / "objects").mkdir(parents=True)
+    (legacy / "objects" / "kept").write_bytes(b"old")
+    store = evidence.evidence_store()
+    assert store.root.resolve() == tmp_path / evidence.DEFAULT_EVIDENCE_DIR
+    assert not legacy.exists()
+    assert (store.objects_dir / "kept").read_bytes() == b"old"
+
+
+def test_store_dir_is_configurable(tmp_path, monkeypatch):
+    monkeypatch.setenv(evidence.EVIDENCE_DIR_ENV, str(tmp_path / "private"))
+    monkeypatch.setattr(evidence, "_store", None)
+    assert evidence.evidence_store().root == tmp_path / "private"
+    assert (tmp_path / "private" / "catalog.db").exists()
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from Checklist.backend import evidence, evidence_api
+
+PREFIX = evidence_api.PREFIX
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = evidence.EvidenceStore(tmp_path / "evidence")
+    monkeypatch.setattr(evidence, "_store", store)
+    return store
+
+
+@pytest.fixture
+def client(store):
+    api = FastAPI()
+    evidence_api.register(api)
+    return TestClient(api)
+
+
+def _begin(client, data, upload_id="file-1"):
+    response = client.post(
+        PREFIX,
+        json={
+            "upload_id": upload_id,
+            "task_name": "Item 1",
+            "filename": "report.pdf",
+            "size": len(data),
+        },
+    )
+    assert response.status_code == 200
+    return response.json()["offset"]
+
+
+def test_resumed_upload_is_stored_once(client, store):
+    data = os.urandom(3000)
+    assert _begin(client, data) == 0
+    response = client.put(f"{PREFIX}/file-1?offset=0", content=data[:1000])
+    assert response.json() == {"offset": 1000}
+    # A retried chunk is refused with the offset to resume from.
+    response = client.put(f"{PREFIX}/file-1?offset=0", content=data[:1000])
+    assert (response.status_code, response.json()) == (409, {"offset": 1000})
+    # After a dropped connection the client asks where to continue.
+    assert _begin(client, data) == 1000
+    client.put(f"{PREFIX}/file-1?offset=1000", content=data[1000:])
+    record = client.post(f"{PREFIX}/file-1/complete").json()
+    assert (record["size"], record["stored"]) == (3000, True)
+    assert store.object_path(record["sha256"]).read_bytes() == data
+    assert [a.filename for a in store.attachments("Item 1")] == ["report.pdf"]
+    assert not any(store.partial_dir.iterdir())
+
+    assert _begin(client, data, upload_id="file-2") == 0
+    client.put(f"{PREFIX}/file-2?offset=0", content=data)
+    assert client.post(f"{PREFIX}/file-2/complete").json()["stored"] is False
+
+
+def test_incomplete_upload_cannot_complete(client):
+    data = b"x" * 10
+    _begin(client, data)
+    client.put(f"{PREFIX}/file-1?offset=0", content=data[:4])
+    response = client.post(f"{PREFIX}/file-1/complete")
+    assert (response.status_code, response.json()) == (409, {"offset": 4})
+    response = client.put(f"{PREFIX}/file-1?offset=4", content=b"x" * 7)
+    assert response.status_code == 409
+
+
+def test_unknown_and_invalid_uploads(client):
+    assert client.put(f"{PREFIX}/missing?offset=0", content=b"x").status_code == 404
+    assert client.post(f"{PREFIX}/missing/complete").status_code == 404
+    assert client.put(f"{PREFIX}/bad.id?offset=0", content=b"x").status_code == 400
+    assert client.post(PREFIX, json={"upload_id": "x"}).status_code == 400
+
+
+def test_abandoned_uploads_are_discarded(store):
+    store.begin_upload("old", "Item 1", "a.txt", 10)
+    store.begin_upload("new", "Item 1", "b.txt", 10)
+    for path in store.partial_dir.glob("old.*"):
+        os.utime(path, (0, 0))
+    assert store.discard_stale_uploads() == 1
+    assert sorted(path.name for path in store.partial_dir.iterdir()) == [
+        "new.json",
+        "new.part",
+    ]
@@ -0,0 +1,50 @@
+import asyncio
+import io
+
+import reflex as rx
+import sqlalchemy as sa
+
+from Checklist.backend.evidence import EvidenceStore
+from Checklist.backend.evidence_catalog import EvidenceCatalog
+
+
+def _upload(data: bytes, filename: str) -> rx.UploadFile:
+    return rx.UploadFile(io.BytesIO(data), filename=filename)
+
+
+def test_attachments_are_kept_per_checklist(tmp_path):
+    store = EvidenceStore(tmp_path / "evidence")
+    asyncio.run(store.save_many("s", "Item 1", [_upload(b"a", "a.txt")], "launch"))
+    asyncio.run(store.save_many("s", "Item 1", [_upload(b"b", "b.txt")]))
+    counts = store.catalog.counts
+    assert counts("launch", ["Item 1", "Item 2"]) == {"Item 1": 1, "Item 2": 0}
+    assert counts("", ["Item 1"]) == {"Item 1": 1}
+    assert counts("other", ["Item 1"]) == {"Item 1": 0}
+    [record] = store.attachments("Item 1", checklist_id="launch")
+    assert (record.checklist_id, record.filename) == ("launch", "a.txt")
+    assert len(store.attachments("Item 1")) == 2
+
+
+def test_old_catalogs_gain_checklist_ids(tmp_path):
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            sa.text(
+                "CREATE TABLE attachments (task_name VARCHAR(255), sha256 VARCHAR(64),"
+                " filename VARCHAR(255), file_type VARCHAR(32),"
+                " content_type VARCHAR(128), size BIGINT, uploaded_at FLOAT,"
+                " PRIMARY KEY (task_name, sha256))"
+            )
+        )
+        conn.execute(sa.text("CREATE INDEX ix_attachments_uploaded ON attachments (uploaded_at)"))
+        conn.execute(
+            sa.text(
+                "INSERT INTO attachments VALUES ('Item 1', 'abc', 'a.pdf', 'pdf',"
+                " 'application/pdf', 3, 1.0)"
+            )
+        )
+    engine.dispose()
+    catalog = EvidenceCatalog(tmp_path / "catalog.db")
+    [record] = catalog.attachments()
+    assert (record.checklist_id, record.task_name, record.filename) == ("", "Item 1", "a.pdf")
+    assert catalog.counts("", ["Item 1"]) == {"Item 1": 1}
@@ -0,0 +1,75 @@
+import pandas as pd
+from openpyxl import load_workbook
+
+from Checklist.backend.exports import (
+    EXPORT_FORMATS,
+    ExportProgress,
+    format_size,
+    submit,
+    write_excel,
+)
+from Checklist.backend.item_store import EXPORT_HEADERS, ItemStore
+from Checklist.backend.repository import StoreView
+
+HEADERS = list(EXPORT_HEADERS.values())
+
+
+def _view(make_items, count):
+    store = ItemStore.from_frame(make_items(count)).prepare()
+    return StoreView(store, store.sort_order("payment"))
+
+
+def test_excel_export_streams_every_row(tmp_path, make_items):
+    view = _view(make_items, 250)
+    progress = ExportProgress(len(view))
+    path = submit(
+        write_excel, view.iter_frames(chunk_size=100), HEADERS, tmp_path / "a.xlsx", progress
+    ).result()
+    rows = list(load_workbook(path, read_only=True).active.iter_rows(values_only=True))
+    assert list(rows[0]) == HEADERS
+    assert [row[0] for row in rows[1:]] == [item.name for item in view.page(0, 250)]
+    assert (progress.done, progress.percent) == (250, 100)
+
+
+def test_progress_of_an_empty_export_is_complete():
+    assert ExportProgress(0).percent == 100
+    progress = ExportProgress(3)
+    progress.advance(1)
+    assert progress.percent == 33
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(1536) == "1.5 KB"
+    assert format_size(5 * 1024**3) == "5.0 GB"
+
+
+def test_columnar_exports_round_trip(tmp_path, make_items):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    view = _view(make_items, 250)
+    expected = pd.concat(view.iter_frames(), ignore_index=True)
+    for name in ["csv.gz", "parquet", "arrow"]:
+        suffix, writer = EXPORT_FORMATS[name]
+        progress = ExportProgress(len(view))
+        path = writer(
+            view.iter_frames(chunk_size=100), HEADERS, tmp_path / f"a{suffix}", progress
+        )
+        if name == "csv.gz":
+            frame = pd.read_csv(path, dtype={"Date": str})
+        elif name == "parquet":
+            assert pq.ParquetFile(path).num_row_groups == 3
+            frame = pq.read_table(path).to_pandas()
+        else:
+            frame = pa.ipc.open_file(path).read_all().to_pandas()
+        pd.testing.assert_frame_equal(frame, expected, check_dtype=False)
+        assert progress.done == 250
+
+
+def test_columnar_exports_of_an_empty_view(tmp_path):
+    import pyarrow.parquet as pq
+
+    suffix, writer = EXPORT_FORMATS["parquet"]
+    path = writer(iter([]), HEADERS, tmp_path / f"empty{suffix}", ExportProgress(0))
+    assert pq.read_table(path).column_names == HEADERS
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Checklist.backend.item_store import COLUMNS, ItemStore
+
+
+@pytest.fixture
+def store(make_items):
+    return ItemStore.from_frame(make_items(300)).prepare()
+
+
+def _sorted_rows(store, column):
+    """The rows ordered by ``column`` with a plain, stable sort."""
+    keys = {
+        "name": [name.lower() for name in store.name],
+        "payment": store.payment.tolist(),
+        "date": store.date.tolist(),
+        "status": [status.lower() for status in store.status],
+    }[column]
+    return sorted(range(len(store)), key=lambda row: keys[row])
+
+
+@pytest.mark.parametrize("column", COLUMNS)
+def test_sort_orders_are_stable(store, column):
+    assert store.sort_order(column).tolist() == _sorted_rows(store, column)
+    assert store.filter_sort("", column, True).tolist() == _sorted_rows(store, column)[::-1]
+
+
+def test_permutations_are_shared_and_read_only(store):
+    order = store.filter_sort("", "payment")
+    assert order is store.sort_order("payment")
+    assert not order.flags.writeable
+    assert not store.filter_sort().flags.writeable
+
+
+@pytest.mark.parametrize("column", COLUMNS)
+def test_filtered_rows_keep_the_sort_order(store, column):
+    rows = store.filter_sort("item 2", column)
+    matches = set(store.search("item 2").tolist())
+    assert rows.tolist() == [row for row in _sorted_rows(store, column) if row in matches]
+
+
+def test_unknown_column_keeps_row_order(store):
+    assert np.array_equal(store.filter_sort("task1", "owner"), store.search("task1"))
+
+
+def test_append_matches_a_rebuilt_store(make_items):
+    first, second = make_items(300), make_items(120, start=300, seed=1)
+    # Only one status in the first part, so the categories must be remapped.
+    first["status"] = "Pending"
+    store = ItemStore.from_frame(first).prepare().freeze()
+    merged = store.append(ItemStore.from_frame(second))
+    rebuilt = ItemStore.from_frame(pd.concat([first, second], ignore_index=True))
+    assert merged.status_categories == rebuilt.status_categories
+    assert np.array_equal(merged.status, rebuilt.status)
+    for column in COLUMNS:
+        # The merged permutations are stable, like a fresh argsort.
+        assert np.array_equal(merged.sort_order(column), rebuilt.sort_order(column))
+    for query in ["item 3", "task31", "completed", "2024-02"]:
+        assert np.array_equal(merged.search(query), rebuilt.search(query))
+    assert merged.nbytes > store.nbytes
+
+
+def test_append_nothing_returns_the_same_store(make_items):
+    store = ItemStore.from_frame(make_items(10))
+    assert store.append(ItemStore.empty()) is store
+
+
+@pytest.mark.parametrize("column", COLUMNS)
+def test_merge_order_keeps_ties_stable(column, make_items):
+    df = make_items(50)
+    df["payment"] = 5.0
+    df["date"] = "2024-01-01"
+    store = ItemStore.from_frame(df)
+    order = np.argsort(store.sort_key(column)[:20], kind="stable")
+    merged = store._merge_order(column, order, 20)
+    assert np.array_equal(merged, np.argsort(store.sort_key(column), kind="stable"))
+    assert not merged.flags.writeable
@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+from Checklist.backend import partitions
+from Checklist.backend.partitions import (
+    PARTITION_BUDGET_ENV,
+    add_items,
+    load_partition,
+    on_evict,
+    partition_stats,
+)
+
+
+@pytest.fixture
+def checklists(tmp_path, monkeypatch, make_items):
+    """Three checklists of 200 items each."""
+    monkeypatch.chdir(tmp_path)
+    for seed, checklist_id in enumerate(["a", "b", "c"]):
+        add_items(checklist_id, make_items(200, seed=seed))
+    return ["a", "b", "c"]
+
+
+@pytest.fixture
+def evicted(monkeypatch):
+    ids = []
+    monkeypatch.setattr(partitions, "_evict_listeners", [])
+    on_evict(ids.append)
+    return ids
+
+
+def test_partitions_are_shared(checklists):
+    store = load_partition("a")
+    assert load_partition("a") is store
+    assert partition_stats()["hits"] == 1
+    assert partition_stats()["bytes"] == store.nbytes
+
+
+def test_least_recently_used_partitions_leave_the_budget(checklists, monkeypatch, evicted):
+    size = load_partition("a").nbytes
+    monkeypatch.setenv(PARTITION_BUDGET_ENV, str(size * 2 + size // 2))
+    load_partition("b")
+    load_partition("a")
+    load_partition("c")
+    assert evicted == ["b"]
+    stats = partition_stats()
+    assert (stats["entries"], stats["evictions"]) == (2, 1)
+    assert stats["bytes"] <= stats["budget"]
+
+
+def test_the_opened_partition_stays_over_budget(checklists, monkeypatch, evicted):
+    monkeypatch.setenv(PARTITION_BUDGET_ENV, "1")
+    load_partition("a")
+    store = load_partition("b")
+    assert evicted == ["a"]
+    assert load_partition("b") is store
+    assert partition_stats()["entries"] == 1
+
+
+def test_concurrent_loads_parse_once(checklists, monkeypatch):
+    parses = []
+    parse_items = partitions.parse_items
+
+    def counted(path):
+        parses.append(path)
+        return parse_items(path)
+
+    monkeypatch.setattr(partitions, "parse_items", counted)
+    stores = []
+    threads = [
+        threading.Thread(target=lambda: stores.append(load_partition("a")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(parses) == 1
+    assert all(store is stores[0] for store in stores)
+    assert partition_stats()["bytes"] == stores[0].nbytes
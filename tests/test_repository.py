@@ -0,0 +1,53 @@
+import pytest
+
+from Checklist.backend.item_store import COLUMNS, ItemStore
+from Checklist.backend.repository import SqlItemRepository, StoreRepository
+
+LIMIT = 25
+
+
+@pytest.fixture
+def repositories(tmp_path, make_items):
+    df = make_items(230)
+    df.to_csv(tmp_path / "items.csv", index=False)
+    sql = SqlItemRepository(f"sqlite:///{tmp_path / 'items.db'}")
+    assert sql.import_csv(str(tmp_path / "items.csv")) == 230
+    return StoreRepository(ItemStore.from_frame(df).prepare()), sql
+
+
+def _names(items):
+    return [item.name for item in items]
+
+
+@pytest.mark.parametrize("sort_value", ["", *COLUMNS])
+@pytest.mark.parametrize("sort_reverse", [False, True])
+@pytest.mark.parametrize("search_value", ["", "item 3"])
+def test_keyset_pages_match_store_view(repositories, sort_value, sort_reverse, search_value):
+    store, sql = repositories
+    expected = store.view(search_value, sort_value, sort_reverse)
+    view = sql.view(search_value, sort_value, sort_reverse)
+    assert len(view) == len(expected)
+    offsets = list(range(0, len(expected), LIMIT))
+    # Forward, then backward from the last page: each step seeks from the
+    # border of the page fetched before it.
+    for offset in offsets + offsets[::-1]:
+        assert _names(view.page(offset, LIMIT)) == _names(expected.page(offset, LIMIT))
+
+
+def test_page_jump_falls_back_to_offset(repositories):
+    store, sql = repositories
+    expected = store.view("", "payment", True)
+    view = sql.view("", "payment", True)
+    assert _names(view.page(150, LIMIT)) == _names(expected.page(150, LIMIT))
+    assert _names(view.page(125, LIMIT)) == _names(expected.page(125, LIMIT))
+
+
+def test_export_frames_match(repositories):
+    store, sql = repositories
+    expected = store.view("", "date", False)
+    view = sql.view("", "date", False)
+    left = list(expected.iter_frames(chunk_size=100))
+    right = list(view.iter_frames(chunk_size=100))
+    assert [len(frame) for frame in right] == [100, 100, 30]
+    for a, b in zip(left, right):
+        assert a.reset_index(drop=True).equals(b.reset_index(drop=True))
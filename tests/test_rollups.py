@@ -0,0 +1,63 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from Checklist.backend.dataset_cache import append_rows, load_snapshot
+from Checklist.backend.rollups import PERIODS, DatasetRollups, dataset_rollups
+from Checklist.views import stats_cards
+from Checklist.views.stats_cards import KpiState
+
+
+@pytest.fixture
+def items_path(tmp_path, make_items):
+    path = str(tmp_path / "items.csv")
+    append_rows(path, make_items(200))
+    return path
+
+
+def _assert_rebuilt(rollups, path):
+    """The running totals match totals aggregated from scratch."""
+    rebuilt = DatasetRollups(*load_snapshot(path))
+    assert rollups.version == rebuilt.version
+    for period in PERIODS:
+        buckets, totals = rollups.periods[period].series()
+        expected_buckets, expected_totals = rebuilt.periods[period].series()
+        assert np.array_equal(buckets, expected_buckets)
+        assert np.allclose(totals, expected_totals)
+        assert rollups.chart_points(period) == rebuilt.chart_points(period)
+
+
+def test_appends_are_added_to_the_totals(items_path, make_items):
+    rollups = dataset_rollups(items_path)
+    rollups.chart_points("month")
+    append_rows(items_path, make_items(30, start=200, seed=1))
+    append_rows(items_path, make_items(5, start=230, seed=2))
+    assert dataset_rollups(items_path) is rollups
+    _assert_rebuilt(rollups, items_path)
+
+
+def test_rewrites_are_diffed_into_the_totals(items_path):
+    rollups = dataset_rollups(items_path)
+    with open(items_path, encoding="utf-8") as file:
+        lines = file.readlines()
+    lines[1] = lines[1].replace("Pending", "Completed").replace("In Progress", "Completed")
+    del lines[5]
+    with open(items_path, "w", encoding="utf-8", newline="") as file:
+        file.write("".join(lines))
+    assert dataset_rollups(items_path) is rollups
+    _assert_rebuilt(rollups, items_path)
+
+
+def test_loading_kpis_watches_the_items_file(tmp_path, monkeypatch, new_state, make_items):
+    monkeypatch.chdir(tmp_path)
+    today = datetime.date.today()
+    items = make_items(3)
+    items["date"] = today.isoformat()
+    append_rows("items.csv", items)
+    watched = []
+    monkeypatch.setattr(stats_cards, "start_watcher", watched.append)
+    state = new_state(KpiState)
+    assert KpiState.load_kpis.fn(state) == KpiState.watch_kpis
+    assert watched == ["items.csv"]
+    assert state.items.text == "3"
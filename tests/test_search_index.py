@@ -0,0 +1,77 @@
+import numpy as np
+
+from Checklist.backend.item_store import ItemStore
+from Checklist.backend.search_index import SearchIndex
+
+
+def _brute_force(store, query, extra=()):
+    """Rows where every query word starts a word of some column."""
+    columns = store.search_columns() + list(extra)
+    words = [
+        " ".join(str(column[row]) for column in columns).lower().split()
+        for row in range(len(store))
+    ]
+    tokens = query.lower().split()
+    return [
+        row
+        for row, row_words in enumerate(words)
+        if all(any(word.startswith(token) for word in row_words) for token in tokens)
+    ]
+
+
+def test_search_matches_word_prefixes(make_items):
+    store = ItemStore.from_frame(make_items(300))
+    index = store.search_index()
+    for query in ["item", "item 3", "task2", "2024-0", "zzz"]:
+        assert index.search(query).tolist() == _brute_force(store, query)
+
+
+def test_statuses_are_matched_through_their_categories(make_items):
+    store = ItemStore.from_frame(make_items(300)).prepare().freeze()
+    for query in ["in prog", "COMPLETED", "pend"]:
+        expected = [
+            row
+            for row in _brute_force(store, query, extra=[store.status])
+            if len(query.split()) == 1 or query.lower() in store.status[row].lower()
+        ]
+        assert store.search(query).tolist() == expected
+    row = int(store.search("pending")[0])
+    index = store.search_index()
+    assert store.set_status(row, "Completed") == "Pending"
+    assert row not in store.search("pending")
+    assert row in store.search("completed")
+    assert store.search_index() is index
+
+
+def test_phrases_must_appear_verbatim(make_items):
+    store = ItemStore.from_frame(make_items(300))
+    # "3 item" matches both words as prefixes but never as a phrase.
+    assert len(store.search_index().search("3 item"))
+    assert not len(store.search("3 item"))
+    assert store.search("item 3").tolist() == [
+        row for row in range(len(store)) if "item 3" in store.name[row]
+    ]
+
+
+def test_empty_query_returns_every_row(make_items):
+    store = ItemStore.from_frame(make_items(20))
+    assert store.search("  ").tolist() == list(range(20))
+    assert not len(SearchIndex.empty().search("item"))
+
+
+def test_extend_matches_build(make_items):
+    store = ItemStore.from_frame(make_items(200))
+    columns = store.search_columns()
+    extended = SearchIndex.build([c[:140] for c in columns]).extend(
+        [c[140:] for c in columns], 140
+    )
+    built = SearchIndex.build(columns)
+    assert np.array_equal(extended.vocab, built.vocab)
+    assert np.array_equal(extended.offsets, built.offsets)
+    assert np.array_equal(extended.rows, built.rows)
+    assert np.array_equal(extended.search("item 1"), built.search("item 1"))
+
+
+def test_extend_without_tokens_is_unchanged():
+    index = SearchIndex.build([np.array(["a b"], dtype=object)])
+    assert index.extend([np.array([], dtype=object)], 1) is index
@@ -0,0 +1,185 @@
+import asyncio
+import time
+
+from Checklist.backend.dataset_cache import append_rows, dataset_changes, dataset_version
+from Checklist.backend.repository import StoreRepository, StoreView, get_repository
+from Checklist.backend.table_state import (
+    ITEMS_PATH,
+    PAGE_CACHE_SIZE,
+    VIRTUAL_KEEP_WINDOWS,
+    VIRTUAL_ROW_HEIGHT,
+    VIRTUAL_WINDOW_ROWS,
+    TableState,
+    _updated_view,
+    change_stats,
+    page_cache_stats,
+    search_stats,
+)
+
+
+def test_empty_items_file_loads_no_rows(tmp_path, monkeypatch, new_state):
+    monkeypatch.chdir(tmp_path)
+    open("items.csv", "w").close()
+    state = new_state(TableState)
+    TableState.load_entries.fn(state)
+    assert (state.total_items, state.filtered_items) == (0, 0)
+    assert state.get_current_page == []
+
+
+def test_only_changes_to_the_page_are_pushed(tmp_path, monkeypatch, new_state, make_items):
+    monkeypatch.chdir(tmp_path)
+    append_rows(ITEMS_PATH, make_items(100))
+    state = new_state(TableState)
+    TableState.load_entries.fn(state)
+    state.search_value = "task1"
+    state._refresh_view()
+    shown, version = state.get_current_page, state._page_version
+    stats = change_stats()
+
+    def apply_append(df):
+        append_rows(ITEMS_PATH, df)
+        repository = get_repository(ITEMS_PATH)
+        changes = dataset_changes(ITEMS_PATH, state._dataset_version)
+        view = _updated_view(repository, state._session().view, changes, "task1", "", False)
+        state._dataset_version = dataset_version(ITEMS_PATH)
+        state._apply_changed_view(view, repository)
+        return view
+
+    extra = make_items(5, start=200)
+    extra["name"] = "extra"
+    view = apply_append(extra)
+    # No appended row matches: the rows of the view are reused as they are.
+    assert view.indices is state._session().view.indices
+    assert (state._page_version, state.get_current_page) == (version, shown)
+    assert change_stats()["skipped"] == stats["skipped"] + 1
+
+    apply_append(make_items(1, start=1))
+    assert state._page_version == version + 1
+    assert state.filtered_items == 12
+    assert change_stats()["pushed"] == stats["pushed"] + 1
+
+
+def _loaded_state(tmp_path, monkeypatch, new_background_state, make_items, count=100):
+    monkeypatch.chdir(tmp_path)
+    append_rows(ITEMS_PATH, make_items(count))
+    proxy = new_background_state(TableState)
+    TableState.load_entries.fn(proxy.__wrapped__)
+    return proxy
+
+
+def test_search_applies_only_the_last_query(tmp_path, monkeypatch, new_background_state, make_items):
+    proxy = _loaded_state(tmp_path, monkeypatch, new_background_state, make_items)
+    proxy.__wrapped__._search_debounce = 0.05
+    stats = search_stats()
+
+    async def type_query():
+        return await asyncio.gather(
+            TableState.set_search_value.fn(proxy, "it"),
+            TableState.set_search_value.fn(proxy, "item 1"),
+        )
+
+    first, last = asyncio.run(type_query())
+    state = proxy.__wrapped__
+    assert first is None and last is not None
+    assert state.search_value == "item 1"
+    assert state.filtered_items == make_items(100)["name"].str.contains("item 1").sum()
+    assert search_stats()["skipped"] == stats["skipped"] + 1
+    assert search_stats()["applied"] == stats["applied"] + 1
+
+
+def test_search_superseded_while_filtering_is_cancelled(tmp_path, monkeypatch, new_background_state, make_items):
+    proxy = _loaded_state(tmp_path, monkeypatch, new_background_state, make_items)
+    proxy.__wrapped__._search_debounce = 0
+    view = StoreRepository.view
+
+    def slow_view(self, search, *args):
+        if search == "it":
+            time.sleep(0.2)
+        return view(self, search, *args)
+
+    monkeypatch.setattr(StoreRepository, "view", slow_view)
+    stats = search_stats()
+
+    async def type_query():
+        slow = asyncio.create_task(TableState.set_search_value.fn(proxy, "it"))
+        await asyncio.sleep(0.05)
+        await TableState.set_search_value.fn(proxy, "item 1")
+        return await slow
+
+    assert asyncio.run(type_query()) is None
+    state = proxy.__wrapped__
+    assert state.search_value == "item 1"
+    assert state.filtered_items == make_items(100)["name"].str.contains("item 1").sum()
+    assert search_stats()["cancelled"] == stats["cancelled"] + 1
+
+
+def test_neighbour_pages_are_prefetched(tmp_path, monkeypatch, new_background_state, make_items):
+    proxy = _loaded_state(tmp_path, monkeypatch, new_background_state, make_items)
+    state = proxy.__wrapped__
+    stats = page_cache_stats()
+    asyncio.run(TableState.prefetch_pages.fn(proxy))
+    assert list(state._session().pages) == [state.limit]
+    expected = state._session().view.page(state.limit, state.limit)
+    assert TableState.next_page.fn(state) == TableState.prefetch_pages
+    assert state.get_current_page == expected
+    assert page_cache_stats()["hits"] == stats["hits"] + 1
+    assert page_cache_stats()["prefetched"] == stats["prefetched"] + 1
+    for _ in range(PAGE_CACHE_SIZE + 2):
+        TableState.next_page.fn(state)
+        asyncio.run(TableState.prefetch_pages.fn(proxy))
+    assert len(state._session().pages) == PAGE_CACHE_SIZE
+    assert state.offset in state._session().pages
+
+
+def test_prefetched_pages_of_an_old_view_are_dropped(tmp_path, monkeypatch, new_background_state, make_items):
+    proxy = _loaded_state(tmp_path, monkeypatch, new_background_state, make_items)
+    state = proxy.__wrapped__
+    page = StoreView.page
+
+    def page_then_resize(self, offset, limit):
+        state.limit = 50
+        return page(self, offset, limit)
+
+    monkeypatch.setattr(StoreView, "page", page_then_resize)
+    asyncio.run(TableState.prefetch_pages.fn(proxy))
+    assert state._session().pages == {}
+
+
+def test_only_the_windows_under_the_scroll_position_are_rendered(tmp_path, monkeypatch, new_background_state, make_items):
+    proxy = _loaded_state(tmp_path, monkeypatch, new_background_state, make_items, count=600)
+    state = proxy.__wrapped__
+    view = state._session().view
+    TableState.set_virtual_mode.fn(state, True)
+    assert state.window_rows == view.page(0, 2 * VIRTUAL_WINDOW_ROWS)
+    assert state.window_padding_top == "0px"
+    assert state.window_padding_bottom == f"{(600 - 100) * VIRTUAL_ROW_HEIGHT}px"
+
+    window_height = VIRTUAL_WINDOW_ROWS * VIRTUAL_ROW_HEIGHT
+    for index in range(1, 8):
+        TableState.scroll_rows.fn(state, index * window_height)
+    assert state.window_index == 7
+    assert state.window_rows == view.page(7 * VIRTUAL_WINDOW_ROWS, 2 * VIRTUAL_WINDOW_ROWS)
+    assert state.window_padding_top == f"{7 * window_height}px"
+    assert max(abs(i - 7) for i in state._session().windows) <= VIRTUAL_KEEP_WINDOWS
+
+    version = state._window_version
+    assert TableState.scroll_rows.fn(state, 7 * window_height + 10) is None
+    assert state._window_version == version
+
+
+def test_the_next_window_is_prefetched(tmp_path, monkeypatch, new_background_state, make_items):
+    proxy = _loaded_state(tmp_path, monkeypatch, new_background_state, make_items, count=600)
+    state = proxy.__wrapped__
+    TableState.set_virtual_mode.fn(state, True)
+    asyncio.run(TableState.prefetch_window.fn(proxy, 2))
+    assert sorted(state._session().windows) == [0, 1, 2]
+    # Windows far from the visible one are not kept.
+    asyncio.run(TableState.prefetch_window.fn(proxy, 2 + VIRTUAL_KEEP_WINDOWS + 1))
+    assert sorted(state._session().windows) == [0, 1, 2]
+    expected = state._session().view.page(VIRTUAL_WINDOW_ROWS, 2 * VIRTUAL_WINDOW_ROWS)
+    reads = []
+    monkeypatch.setattr(StoreView, "page", lambda self, *args: reads.append(args))
+    TableState.scroll_rows.fn(state, VIRTUAL_WINDOW_ROWS * VIRTUAL_ROW_HEIGHT)
+    # Both rendered windows were cached: scrolling reads nothing from the view.
+    assert state.window_rows == expected
+    assert reads == []
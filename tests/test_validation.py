@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from Checklist.backend.validation import (
+    INVALID_DATE,
+    INVALID_PAYMENT,
+    INVALID_STATUS,
+    validate_columns,
+)
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=["name", "payment", "date", "status"])
+
+
+def test_rows_are_rejected_for_every_reason():
+    df = _frame(
+        [
+            ["ok", "1.5", "2024-01-02", "Pending"],
+            ["negative", "-1", "2024-01-02", "Completed"],
+            ["text", "abc", "2024-13-40", "Done"],
+            ["free", "0", "2024-02-29", "In Progress"],
+        ]
+    )
+    report, payment, date_value = validate_columns(df)
+    assert report.accepted.tolist() == [True, False, False, True]
+    assert (report.accepted_count, report.rejected_count) == (2, 2)
+    assert report.counts() == {INVALID_PAYMENT: 2, INVALID_STATUS: 1, INVALID_DATE: 1}
+    assert list(report.rejected_rows()) == [
+        (1, [INVALID_PAYMENT]),
+        (2, [INVALID_PAYMENT, INVALID_STATUS, INVALID_DATE]),
+    ]
+    assert payment[0] == 1.5 and np.isnan(payment[2])
+    assert str(date_value[3]) == "2024-02-29"
+    assert report.summary().startswith("Rejected 2 of 4 rows:")
+
+
+def test_allowed_statuses_can_be_narrowed():
+    df = _frame([["a", "1", "2024-01-01", "Pending"]])
+    report, _, _ = validate_columns(df, allowed_statuses=["Completed"])
+    assert report.counts() == {INVALID_STATUS: 1}
+
+
+def test_extended_report_offsets_the_rows():
+    first, _, _ = validate_columns(_frame([["a", "-1", "2024-01-01", "Pending"]]))
+    second, _, _ = validate_columns(
+        _frame([["b", "1", "2024-01-01", "Pending"], ["c", "1", "bad", "Pending"]])
+    )
+    report = first.extend(second)
+    assert report.total == 3
+    assert report.accepted.tolist() == [False, True, False]
+    assert dict(report.rejected_rows()) == {0: [INVALID_PAYMENT], 2: [INVALID_DATE]}
+
+
+def test_valid_rows_summary():
+    report, _, _ = validate_columns(_frame([["a", "2", "2024-01-01", "Completed"]]))
+    assert report.summary() == "All 1 rows are valid."